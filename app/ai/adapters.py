@@ -0,0 +1,39 @@
+"""
+DSPy Adapters
+
+Prompt adapters used by the search pipeline.
+Single Responsibility: Only formats signatures into LM messages.
+"""
+
+from typing import Dict
+
+import dspy
+from dspy.adapters.chat_adapter import ChatAdapter
+
+
+class PrecompiledChatAdapter(ChatAdapter):
+    """
+    ChatAdapter that renders each signature's system message once.
+
+    The system message (field descriptions, structure, instructions) is
+    constant for a signature, so only the per-call user message (context,
+    question) is formatted on each request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._system_messages: Dict[type, str] = {}
+
+    def format_system_message(self, signature: type[dspy.Signature]) -> str:
+        """Return the memoized system message for a signature."""
+        message = self._system_messages.get(signature)
+        if message is None:
+            message = super().format_system_message(signature)
+            self._system_messages[signature] = message
+        return message
+
+    def warm(self, *modules: dspy.Module) -> None:
+        """Pre-render system messages for every predictor in the modules."""
+        for module in modules:
+            for _, predictor in module.named_predictors():
+                self.format_system_message(predictor.signature)
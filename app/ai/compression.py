@@ -0,0 +1,52 @@
+"""
+Prompt Compression
+
+Extractive compression of retrieved passages before the answer LLM call.
+Single Responsibility: Only shrinks context text while keeping key facts.
+"""
+
+import heapq
+import math
+import re
+from typing import List
+
+from app.search.bm25 import bm25_scores
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def compress_passage(question: str, passage: str, ratio: float = 0.5) -> str:
+    """
+    Keep the passage sentences most relevant to the question.
+
+    The leading segment (usually the title) is always kept; the rest are
+    ranked by BM25 against the question and the top ``ratio`` share is
+    kept in original order.
+
+    Args:
+        question: The user's question
+        passage: Passage text
+        ratio: Fraction of sentences to keep (0-1)
+
+    Returns:
+        Compressed passage text
+    """
+    segments = [s.strip() for s in _SENTENCE_RE.split(passage) if s.strip()]
+    if len(segments) <= 2:
+        return passage
+
+    head, body = segments[0], segments[1:]
+    keep_n = max(1, math.ceil(len(body) * ratio))
+    scores = bm25_scores(question, body)
+    keep = sorted(heapq.nlargest(keep_n, range(len(body)), key=scores.__getitem__))
+    return " ".join([head] + [body[i] for i in keep])
+
+
+def compress_passages(
+    question: str, passages: List[str], indices: List[int], ratio: float = 0.5
+) -> List[str]:
+    """Compress the passages at ``indices``, leaving the others untouched."""
+    compressed = list(passages)
+    for i in indices:
+        compressed[i] = compress_passage(question, passages[i], ratio)
+    return compressed
@@ -7,6 +7,7 @@ Open/Closed: Easy to add new providers without modifying existing code.
 """
 
 import logging
+from functools import lru_cache
 from typing import Optional
 
 import dspy
@@ -16,6 +17,7 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
 def create_llm(
     provider: Optional[str] = None,
     model_override: Optional[str] = None,
@@ -23,6 +25,9 @@ def create_llm(
     """
     Create LLM instance based on provider.
 
+    Instances are cached per (provider, model_override), so repeated
+    pipeline construction reuses the same LM and its HTTP client.
+
     Args:
         provider: LLM provider ("gemini", "groq", "ollama", "openai")
         model_override: Optional model name override
@@ -34,7 +39,7 @@ def create_llm(
         ValueError: If provider is unknown or API key missing
     """
     provider = (provider or settings.LLM_PROVIDER).lower()
-    logger.info(f"🤖 Creating LLM | Provider: {provider.upper()}")
+    logger.info("🤖 Creating LLM | Provider: %s", provider.upper())
 
     if provider == "gemini":
         return _create_gemini_lm(model_override)
@@ -60,7 +65,7 @@ def _create_gemini_lm(model_override: Optional[str] = None) -> dspy.LM:
         raise ValueError("GEMINI_API_KEY not set in environment")
 
     model = model_override or settings.GEMINI_MODEL
-    logger.info(f"Using Gemini model: {model}")
+    logger.info("Using Gemini model: %s", model)
 
     return dspy.LM(
         model=f"gemini/{model}",
@@ -77,7 +82,7 @@ def _create_groq_lm(model_override: Optional[str] = None) -> dspy.LM:
         raise ValueError("GROQ_API_KEY not set in environment")
 
     model = model_override or settings.GROQ_MODEL
-    logger.info(f"Using Groq model: {model}")
+    logger.info("Using Groq model: %s", model)
 
     return dspy.LM(
         model=f"groq/{model}",
@@ -90,7 +95,7 @@ def _create_groq_lm(model_override: Optional[str] = None) -> dspy.LM:
 def _create_ollama_lm(model_override: Optional[str] = None) -> dspy.LM:
     """Create Ollama LLM."""
     model = model_override or settings.OLLAMA_MODEL
-    logger.info(f"Using Ollama model: {model} at {settings.OLLAMA_BASE_URL}")
+    logger.info("Using Ollama model: %s at %s", model, settings.OLLAMA_BASE_URL)
 
     return dspy.LM(
         model=f"ollama/{model}",
@@ -107,7 +112,7 @@ def _create_openai_lm(model_override: Optional[str] = None) -> dspy.LM:
         raise ValueError("OPENAI_API_KEY not set in environment")
 
     model = model_override or settings.OPENAI_MODEL
-    logger.info(f"Using OpenAI model: {model}")
+    logger.info("Using OpenAI model: %s", model)
 
     return dspy.LM(model=f"openai/{model}", api_key=api_key, max_tokens=1000)
 
@@ -119,7 +124,7 @@ def _create_openrouter_lm(model_override: Optional[str] = None) -> dspy.LM:
         raise ValueError("OPENROUTER_API_KEY not set in environment")
 
     model = model_override or settings.OPENROUTER_MODEL
-    logger.info(f"Using OpenRouter model: {model}")
+    logger.info("Using OpenRouter model: %s", model)
 
     return dspy.LM(
         model=f"openai/{model}",
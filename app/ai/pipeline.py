@@ -5,25 +5,79 @@ Main search and reasoning pipeline.
 Single Responsibility: Orchestrates search + AI reasoning.
 """
 
+import asyncio
+import hashlib
+import heapq
 import logging
+import re
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import dspy
+import orjson
+from cachetools import TTLCache
 
+from app.ai.adapters import PrecompiledChatAdapter
+from app.ai.compression import compress_passages
 from app.ai.llm_providers import create_llm
-from app.ai.signatures import ContextRanker, QueryDecomposer, SearchQA
+from app.ai.signatures import ContextRanker, FusedQA, QueryDecomposer, SearchQA
+from app.cache.semantic import get_semantic_cache
 from app.core.config import settings
+from app.search.bm25 import bm25_scores
 from app.search.dspy_retriever import SearXNGRetriever
+from app.utils.text import clean_text, count_tokens, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
+_IDX_RE = re.compile(r"\d+")
+_CONF_RE = re.compile(r"([-+]?\d*\.?\d+)\s*(%)?")
+
+# LM chosen by cascade routing for the current request (None = default LM)
+_ROUTED_LM: ContextVar[Optional[dspy.LM]] = ContextVar("routed_lm", default=None)
+
+# Whether the current request wants context passages in its response
+_INCLUDE_CONTEXT: ContextVar[bool] = ContextVar("include_context", default=True)
+
+COMPLEX_INDICATORS = [
+    "compare",
+    "vs",
+    "versus",
+    "difference between",
+    "pros and cons",
+    "advantages and disadvantages",
+    "how does",
+    "why does",
+    "explain the relationship",
+    "what are the",
+    " and ",
+    "best practices for",
+]
+# One alternation scans the query once instead of once per indicator
+_COMPLEX_RE = re.compile("|".join(re.escape(i) for i in COMPLEX_INDICATORS))
+
+# DSPy modules carry no LM state (it is bound per call via dspy.context),
+# so every pipeline instance shares one set
+_ANSWER = dspy.ChainOfThought(SearchQA)
+_RANKER = dspy.ChainOfThought(ContextRanker)
+_DECOMPOSER = dspy.ChainOfThought(QueryDecomposer)
+_FUSED = dspy.ChainOfThought(FusedQA)
+
+# System prompts for the fixed signatures are rendered once, at import
+_ADAPTER = PrecompiledChatAdapter()
+_ADAPTER.warm(_ANSWER, _RANKER, _DECOMPOSER, _FUSED)
+
 
 class DSPyPipeline:
     """
     DSPy pipeline for search + reasoning.
 
     Thread-safe: Uses dspy.context() for concurrent requests.
+    Async methods (a*) run LLM calls on DSPy's worker pool via dspy.asyncify,
+    so they never block the event loop.
     """
 
     def __init__(
@@ -37,127 +91,896 @@ class DSPyPipeline:
         self._lm = create_llm(self._provider, lm_model)
         self._model_name = getattr(self._lm, "model", "unknown")
 
-        logger.info(f"✅ LLM Ready | Model: {self._model_name}")
+        logger.info("✅ LLM Ready | Model: %s", self._model_name)
+        self._configure_defaults()
+
+        # Cascade routing: simple queries go to a cheap, fast model
+        self._lm_fast: Optional[dspy.LM] = None
+        if settings.LLM_ROUTING_MODE.lower() == "cascade":
+            try:
+                self._lm_fast = create_llm(
+                    settings.FAST_LLM_PROVIDER, settings.FAST_LLM_MODEL
+                )
+                logger.info(
+                    "⚡ Cascade routing | Fast model: %s",
+                    getattr(self._lm_fast, "model", "unknown"),
+                )
+            except ValueError as e:
+                logger.warning("Fast LLM unavailable, routing disabled: %s", e)
 
         self.retriever = SearXNGRetriever(searx_url=searx_url, k=k_results)
-        logger.info(f"🔍 Retriever configured | k={k_results}")
+        logger.info("🔍 Retriever configured | k=%s", k_results)
+
+        self.answer = _ANSWER
+        self.ranker = _RANKER
+        self.decomposer = _DECOMPOSER
+        self.fused = _FUSED
+
+        # Async wrappers: inherit the caller's dspy.context() per call
+        self._aanswer = dspy.asyncify(self.answer)
+        self._aranker = dspy.asyncify(self.ranker)
+        self._adecomposer = dspy.asyncify(self.decomposer)
+        self._afused = dspy.asyncify(self.fused)
+
+        # In-process response caches keyed by (model, signature, inputs)
+        ttl = settings.LLM_CACHE_TTL
+        self._answer_cache = TTLCache(maxsize=settings.LLM_CACHE_SIZE, ttl=ttl)
+        self._rerank_cache = TTLCache(maxsize=settings.LLM_CACHE_SIZE * 2, ttl=ttl)
+        self._decompose_cache = TTLCache(maxsize=settings.LLM_CACHE_SIZE, ttl=ttl)
+        self._cache_lock = threading.Lock()
+        self._prefix_warned = False
+
+    def _active_lm(self) -> dspy.LM:
+        """LM for the current request: the routed one, else the default."""
+        return _ROUTED_LM.get() or self._lm
+
+    @contextmanager
+    def _route_simple(self):
+        """Bind the fast LM (cascade mode) while answering a simple query."""
+        if self._lm_fast is None:
+            yield
+            return
+        token = _ROUTED_LM.set(self._lm_fast)
+        try:
+            yield
+        finally:
+            _ROUTED_LM.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def _context_option(include_context: bool):
+        """Bind the request's include_context flag for _build_response."""
+        token = _INCLUDE_CONTEXT.set(include_context)
+        try:
+            yield
+        finally:
+            _INCLUDE_CONTEXT.reset(token)
+
+    @property
+    def _fuse_stages(self) -> bool:
+        """Fused rerank+answer needs room for both outputs in one completion."""
+        lm = self._active_lm()
+        max_tokens = getattr(lm, "kwargs", {}).get("max_tokens") or 0
+        return settings.FUSE_LLM_STAGES and max_tokens >= settings.FUSED_MIN_MAX_TOKENS
+
+    def _configure_defaults(self) -> None:
+        """
+        Install this pipeline's LM and adapter as DSPy's process-wide defaults.
+
+        Calls that match the defaults then skip dspy.context entirely. DSPy
+        only lets the first configuring thread/task reconfigure, so later
+        pipelines fall back to per-call contexts.
+        """
+        try:
+            dspy.configure(
+                lm=self._lm,
+                adapter=_ADAPTER,
+                async_max_workers=settings.DSPY_ASYNC_MAX_WORKERS,
+            )
+        except RuntimeError as e:
+            logger.debug("DSPy defaults not configured, using per-call context: %s", e)
+
+    def _lm_context(self, stream: bool = False):
+        """DSPy context binding the active LM, adapter and async worker limit."""
+        lm = self._active_lm()
+        if not stream and dspy.settings.lm is lm and dspy.settings.adapter is _ADAPTER:
+            return nullcontext()  # Already the effective settings
+        # StreamListener only recognizes DSPy's own adapter classes
+        return dspy.context(
+            lm=lm,
+            adapter=None if stream else _ADAPTER,
+            async_max_workers=settings.DSPY_ASYNC_MAX_WORKERS,
+        )
+
+    def _cache_key(self, signature: str, **inputs: Any) -> str:
+        """Hash model, signature name and inputs into a response cache key."""
+        model = getattr(self._active_lm(), "model", self._model_name)
+        payload = orjson.dumps(
+            {"model": model, "sig": signature, **inputs},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _cached_call(
+        self, signature: str, module, cache: TTLCache, **inputs: Any
+    ) -> dspy.Prediction:
+        """Call a DSPy module, reusing a cached prediction for identical inputs."""
+        key = self._cache_key(signature, **inputs)
+        with self._cache_lock:
+            cached = cache.get(key)
+        if cached is not None:
+            logger.debug("LLM cache HIT for %s", signature)
+            return cached
+
+        with self._lm_context():
+            result = module(**inputs)
+
+        with self._cache_lock:
+            cache[key] = result
+        return result
+
+    async def _acached_call(
+        self, signature: str, amodule, cache: TTLCache, **inputs: Any
+    ) -> dspy.Prediction:
+        """Async _cached_call for dspy.asyncify-wrapped modules."""
+        key = self._cache_key(signature, **inputs)
+        with self._cache_lock:
+            cached = cache.get(key)
+        if cached is not None:
+            logger.debug("LLM cache HIT for %s", signature)
+            return cached
+
+        with self._lm_context():
+            result = await amodule(**inputs)
+
+        with self._cache_lock:
+            cache[key] = result
+        return result
+
+    def _batched_call(
+        self, signature: str, module, cache: TTLCache, inputs: List[Dict[str, Any]]
+    ) -> List[Optional[dspy.Prediction]]:
+        """
+        _cached_call over many inputs: cache misses go through one module.batch.
+
+        Returns one prediction per input, in order (None where the call failed).
+        """
+        keys = [self._cache_key(signature, **kwargs) for kwargs in inputs]
+        with self._cache_lock:
+            results = [cache.get(key) for key in keys]
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+
+        examples = [dspy.Example(**inputs[i]).with_inputs(*inputs[i]) for i in misses]
+        with self._lm_context():
+            predictions = module.batch(
+                examples,
+                num_threads=min(len(examples), settings.DSPY_ASYNC_MAX_WORKERS),
+                max_errors=len(examples),
+                disable_progress_bar=True,
+            )
+
+        with self._cache_lock:
+            for i, prediction in zip(misses, predictions):
+                results[i] = prediction
+                if prediction is not None:
+                    cache[keys[i]] = prediction
+        return results
+
+    async def astream_answer(
+        self, question: str, include_context: bool = True
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Search and answer, streaming answer tokens as the LLM emits them.
+
+        Yields {"type": "token", "content": ...} events, then a single
+        {"type": "result", "result": ...} carrying the search_and_answer
+        dict (or {"type": "error", "message": ...}). Always uses the staged
+        rerank + answer path: fused answers cite candidate indices that are
+        only renumbered after generation, so they can't be streamed as-is.
+        """
+        with self._context_option(include_context):
+            cached = await self._asemantic_lookup(question)
+            if cached is not None:
+                yield {"type": "token", "content": cached["answer"]}
+                yield {"type": "result", "result": cached}
+                return
+
+            with self._route_simple():
+                async for event in self._astream_answer(question):
+                    yield event
+
+    async def _astream_answer(
+        self, question: str
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Uncached astream_answer."""
+        try:
+            passages, raw_results = await self._aretrieve(question)
+            if not passages:
+                result = self._empty_result(question)
+                yield {"type": "token", "content": result["answer"]}
+                yield {"type": "result", "result": result}
+                return
+
+            passages, raw_results = self._prefilter(question, passages, raw_results)
+            selected_indices = await self._arerank_passages(
+                question, passages, raw_results
+            )
+            numbered_context, selected_indices = self._build_context(
+                question,
+                passages,
+                selected_indices,
+                settings.CONTEXT_TOKENS,
+                raw_results,
+            )
+            inputs = {"context": numbered_context, "question": question}
+
+            key = self._cache_key("SearchQA", **inputs)
+            with self._cache_lock:
+                prediction = self._answer_cache.get(key)
+
+            streamed = False
+            if prediction is None:
+                stream = dspy.streamify(
+                    self.answer,
+                    stream_listeners=[
+                        dspy.streaming.StreamListener(signature_field_name="answer")
+                    ],
+                )
+                start_llm = time.time()
+                with self._lm_context(stream=True):
+                    async for chunk in stream(**inputs):
+                        if isinstance(chunk, dspy.streaming.StreamResponse):
+                            streamed = True
+                            yield {"type": "token", "content": chunk.chunk}
+                        elif isinstance(chunk, dspy.Prediction):
+                            prediction = chunk
+                logger.info("✅ LLM stream finished in %.2fs", time.time() - start_llm)
+
+                with self._cache_lock:
+                    self._answer_cache[key] = prediction
+
+            # Cache hit, or a provider that doesn't stream: emit in one piece
+            if not streamed:
+                yield {"type": "token", "content": prediction.answer}
+
+            result = self._build_response(
+                question, prediction, selected_indices, raw_results
+            )
+            result = await self._asemantic_store(question, result)
+            yield {"type": "result", "result": result}
+
+        except Exception as e:
+            logger.error("DSPy streaming pipeline failed: %s", e)
+            yield {"type": "error", "message": str(e)}
+
+    def _semantic_lookup(self, question: str) -> Optional[Dict]:
+        """Answer for a near-duplicate prior question, if cached."""
+        cache = get_semantic_cache()
+        if cache is None:
+            return None
+        cached = cache.get(question, self._model_name)
+        if cached is None:
+            return None
+        if cached.get("context") is None and _INCLUDE_CONTEXT.get():
+            return None  # Cached without context; this request needs it
+        return {**cached, "question": question}
+
+    def _semantic_store(self, question: str, result: Dict) -> Dict:
+        """Cache a successful (sourced) result for near-duplicate questions."""
+        cache = get_semantic_cache()
+        if cache is not None and result.get("sources"):
+            cache.set(question, result, self._model_name)
+        return result
+
+    async def _asemantic_lookup(self, question: str) -> Optional[Dict]:
+        """_semantic_lookup off the event loop (hits read SQLite)."""
+        if get_semantic_cache() is None:
+            return None
+        return await asyncio.to_thread(self._semantic_lookup, question)
+
+    async def _asemantic_store(self, question: str, result: Dict) -> Dict:
+        """_semantic_store off the event loop (writes go to SQLite)."""
+        if get_semantic_cache() is None or not result.get("sources"):
+            return result
+        return await asyncio.to_thread(self._semantic_store, question, result)
 
-        self.answer = dspy.ChainOfThought(SearchQA)
-        self.ranker = dspy.ChainOfThought(ContextRanker)
-        self.decomposer = dspy.ChainOfThought(QueryDecomposer)
+    async def _aretrieve(self, query: str) -> Tuple[List[str], List[Dict]]:
+        """Retrieve (passages, raw_results) without blocking the event loop."""
+        logger.debug("🔍 Retrieving: %s", query)
+        return await self.retriever.aretrieve(query)
 
     async def process_results(self, query: str, results: List[Dict]) -> Dict:
         """Process search results (compatibility method)."""
-        return self.search_and_answer(query)
+        return await self.asearch_and_answer(query)
 
-    def search_and_answer(self, question: str) -> Dict:
-        """Search the web and answer using DSPy."""
+    def search_and_answer(self, question: str, include_context: bool = True) -> Dict:
+        """
+        Search the web and answer using DSPy.
+
+        With include_context=False the response's context list is skipped
+        (context is None); sources are still returned.
+        """
+        with self._context_option(include_context):
+            cached = self._semantic_lookup(question)
+            if cached is not None:
+                return cached
+            with self._route_simple():
+                result = self._search_and_answer(question)
+            return self._semantic_store(question, result)
+
+    def _search_and_answer(self, question: str) -> Dict:
+        """Uncached search_and_answer."""
         try:
-            logger.info(f"📝 Processing question: {question[:80]}...")
+            logger.info("📝 Processing question: %s...", question[:80])
 
             # Step 1: Retrieval
             start_retrieval = time.time()
-            passages = self.retriever(question)
+            passages, raw_results = self.retriever.retrieve(question)
             retrieval_time = time.time() - start_retrieval
             logger.info(
-                f"🔍 Retrieved {len(passages)} passages in {retrieval_time:.2f}s"
+                "🔍 Retrieved %s passages in %.2fs", len(passages), retrieval_time
             )
 
             if not passages:
                 return self._empty_result(question)
 
+            passages, raw_results = self._prefilter(question, passages, raw_results)
+
+            if self._fuse_stages:
+                response = self._fused_answer(question, passages, raw_results)
+                if response is not None:
+                    return response
+
             # Step 2: Reranking
             logger.info("⚖️ Reranking passages...")
             start_rerank = time.time()
-            selected_indices = self._rerank_passages(question, passages)
+            selected_indices = self._rerank_passages(question, passages, raw_results)
             rerank_time = time.time() - start_rerank
             logger.info(
-                f"✅ Selected {len(selected_indices)}/{len(passages)} passages "
-                f"in {rerank_time:.2f}s"
+                "✅ Selected %s/%s passages in %.2fs",
+                len(selected_indices),
+                len(passages),
+                rerank_time,
             )
 
             # Step 3: Synthesis with numbered passages for citations
-            ranked_passages = [passages[i] for i in selected_indices]
-            # Format with citation markers: [0], [1], etc.
-            numbered_context = "\n\n".join(
-                [f"[{idx}] {p}" for idx, p in enumerate(ranked_passages)]
+            numbered_context, selected_indices = self._build_context(
+                question,
+                passages,
+                selected_indices,
+                settings.CONTEXT_TOKENS,
+                raw_results,
             )
+            self._warn_short_prefix(numbered_context)
 
             logger.info(
-                f"🧠 Calling LLM | Provider: {self._provider.upper()} | "
-                f"Model: {self._model_name}"
+                "🧠 Calling LLM | Provider: %s | Model: %s",
+                self._provider.upper(),
+                getattr(self._active_lm(), "model", self._model_name),
             )
             start_llm = time.time()
 
-            with dspy.context(lm=self._lm):
-                result = self.answer(context=numbered_context[:3000], question=question)
+            result = self._cached_call(
+                "SearchQA",
+                self.answer,
+                self._answer_cache,
+                context=numbered_context,
+                question=question,
+            )
 
             llm_time = time.time() - start_llm
-            logger.info(f"✅ LLM responded in {llm_time:.2f}s")
+            logger.info("✅ LLM responded in %.2fs", llm_time)
 
-            return self._build_response(question, result, selected_indices)
+            return self._build_response(question, result, selected_indices, raw_results)
 
         except Exception as e:
-            logger.error(f"DSPy pipeline failed: {e}")
-            return {
-                "question": question,
-                "answer": f"Error: {str(e)}",
-                "context": [],
-                "confidence": 0.0,
-            }
+            logger.error("DSPy pipeline failed: %s", e)
+            return self._error_result(question, e)
 
-    def _rerank_passages(self, question: str, passages: List[str]) -> List[int]:
-        """Rerank passages factoring in both relevance and credibility."""
-        if not passages:
+    def search_and_answer_multi(
+        self, questions: List[str], include_context: bool = True
+    ) -> List[Dict]:
+        """
+        Answer several independent questions with batched LLM stages.
+
+        Retrieval runs concurrently (at most RETRIEVAL_CONCURRENCY SearXNG
+        calls at once); the fused (or rerank, then answer) stage goes through
+        a single module.batch over all questions instead of N serial calls.
+        Like search_and_answer, it consults the semantic cache and routes to
+        the fast LM in cascade mode. Complex questions are not decomposed:
+        decomposition is a per-question LLM round-trip that can't share the
+        batch.
+        """
+        if not questions:
             return []
 
-        raw_results = getattr(self.retriever, "_last_results", [])
+        with self._context_option(include_context):
+            responses: List[Optional[Dict]] = [
+                self._semantic_lookup(q) for q in questions
+            ]
+            misses = [i for i, response in enumerate(responses) if response is None]
+            if misses:
+                with self._route_simple():
+                    answers = self._search_and_answer_multi(
+                        [questions[i] for i in misses]
+                    )
+                for i, result in zip(misses, answers):
+                    responses[i] = self._semantic_store(questions[i], result)
+        return responses
+
+    def _search_and_answer_multi(self, questions: List[str]) -> List[Dict]:
+        """Uncached search_and_answer_multi."""
+        workers = min(len(questions), settings.RETRIEVAL_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            retrieved = list(pool.map(self.retriever.retrieve, questions))
 
-        # Format context for ranking (index + credibility + preview)
-        context_lines = []
-        for i, p in enumerate(passages):
-            cred = (
-                raw_results[i].get("credibility_score", 0.5)
-                if i < len(raw_results)
-                else 0.5
+        live = []  # (question index, passages, raw_results)
+        responses: List[Optional[Dict]] = [None] * len(questions)
+        for i, (question, (passages, raw_results)) in enumerate(
+            zip(questions, retrieved)
+        ):
+            if passages:
+                live.append((i, *self._prefilter(question, passages, raw_results)))
+            else:
+                responses[i] = self._empty_result(question)
+
+        if self._fuse_stages and live:
+            live = self._fused_answer_multi(questions, live, responses)
+        if not live:
+            return responses
+
+        rankings = self._batched_call(
+            "ContextRanker",
+            self.ranker,
+            self._rerank_cache,
+            [
+                {"query": questions[i], "context": self._rerank_context(p, r)}
+                for i, p, r in live
+            ],
+        )
+
+        contexts = []
+        for (i, passages, raw_results), ranking in zip(live, rankings):
+            if ranking is None:
+                indices = list(range(min(5, len(passages))))
+            else:
+                indices = self._select_indices(
+                    ranking.selected_indices, passages, raw_results
+                )
+            contexts.append(
+                self._build_context(
+                    questions[i],
+                    passages,
+                    indices,
+                    settings.CONTEXT_TOKENS,
+                    raw_results,
+                )
             )
-            context_lines.append(f"[{i}] (credibility: {cred:.2f}) {p[:180]}...")
-        context_str = "\n".join(context_lines)
 
+        logger.info("🧠 Batch-answering %s questions", len(live))
+        answers = self._batched_call(
+            "SearchQA",
+            self.answer,
+            self._answer_cache,
+            [
+                {"context": context, "question": questions[i]}
+                for (i, _, _), (context, _) in zip(live, contexts)
+            ],
+        )
+
+        for (i, _, raw_results), (_, indices), result in zip(live, contexts, answers):
+            question = questions[i]
+            if result is None:
+                responses[i] = self._error_result(
+                    question, RuntimeError("batched LLM call failed")
+                )
+            else:
+                responses[i] = self._build_response(
+                    question, result, indices, raw_results
+                )
+        return responses
+
+    async def asearch_and_answer(
+        self, question: str, include_context: bool = True
+    ) -> Dict:
+        """Async search_and_answer: retrieval and LLM calls run off the loop."""
+        with self._context_option(include_context):
+            cached = await self._asemantic_lookup(question)
+            if cached is not None:
+                return cached
+            with self._route_simple():
+                result = await self._asearch_and_answer(question)
+            return await self._asemantic_store(question, result)
+
+    async def _asearch_and_answer(self, question: str) -> Dict:
+        """Uncached asearch_and_answer."""
         try:
-            with dspy.context(lm=self._lm):
-                result = self.ranker(query=question, context=context_str)
-
-            indices_str = result.selected_indices
-            # Parse indices: "1, 3, 5" -> [1, 3, 5]
-            indices = [
-                int(i.strip())
-                for i in indices_str.replace(".", ",").split(",")
-                if i.strip().isdigit()
-            ]
+            logger.info("📝 Processing question: %s...", question[:80])
 
-            # Filter valid indices
-            valid_indices = [i for i in indices if 0 <= i < len(passages)]
+            start_retrieval = time.time()
+            passages, raw_results = await self._aretrieve(question)
+            retrieval_time = time.time() - start_retrieval
+            logger.info(
+                "🔍 Retrieved %s passages in %.2fs", len(passages), retrieval_time
+            )
+
+            if not passages:
+                return self._empty_result(question)
+
+            passages, raw_results = self._prefilter(question, passages, raw_results)
+
+            if self._fuse_stages:
+                response = await self._afused_answer(question, passages, raw_results)
+                if response is not None:
+                    return response
+
+            selected_indices = await self._arerank_passages(
+                question, passages, raw_results
+            )
+            numbered_context, selected_indices = self._build_context(
+                question,
+                passages,
+                selected_indices,
+                settings.CONTEXT_TOKENS,
+                raw_results,
+            )
+            self._warn_short_prefix(numbered_context)
+
+            start_llm = time.time()
+            result = await self._acached_call(
+                "SearchQA",
+                self._aanswer,
+                self._answer_cache,
+                context=numbered_context,
+                question=question,
+            )
+            logger.info("✅ LLM responded in %.2fs", time.time() - start_llm)
+
+            return self._build_response(question, result, selected_indices, raw_results)
+
+        except Exception as e:
+            logger.error("DSPy pipeline failed: %s", e)
+            return self._error_result(question, e)
+
+    @staticmethod
+    def _stable_order(indices: List[int], raw_results: List[Dict]) -> List[int]:
+        """
+        Order selected indices by URL hash, independent of retrieval order.
+
+        The same passage set then always yields a byte-identical context,
+        so provider-side prompt prefix caches (OpenAI, Gemini, etc.) hit.
+        """
+
+        def url_hash(i: int) -> str:
+            url = raw_results[i].get("url", "") if i < len(raw_results) else ""
+            return hashlib.sha1(url.encode()).hexdigest()
+
+        return sorted(indices, key=url_hash)
+
+    @staticmethod
+    def _numbered_context(passages: List[str], indices: List[int]) -> str:
+        """Format selected passages with citation markers: [0], [1], etc."""
+        ranked_passages = [clean_text(passages[i]) for i in indices]
+        return "\n\n".join([f"[{idx}] {p}" for idx, p in enumerate(ranked_passages)])
+
+    def _build_context(
+        self,
+        question: str,
+        passages: List[str],
+        indices: List[int],
+        max_tokens: int,
+        raw_results: List[Dict],
+    ) -> Tuple[str, List[int]]:
+        """
+        Compress (if enabled) and fit selected passages into the token budget.
 
-            if not valid_indices:
-                logger.warning(
-                    "Reranker returned no valid indices, using top by credibility"
+        ``indices`` are in reranker order, so the budget drops the lowest
+        ranked passages; survivors are then put in URL-hash order.
+        Compression only kicks in when the selected passages exceed
+        PROMPT_COMPRESSION_MIN_TOKENS, so short contexts pay nothing.
+        """
+        if settings.ENABLE_PROMPT_COMPRESSION:
+            total = sum(count_tokens(passages[i]) for i in indices)
+            if total > settings.PROMPT_COMPRESSION_MIN_TOKENS:
+                passages = compress_passages(
+                    question, passages, indices, settings.PROMPT_COMPRESSION_RATIO
                 )
-                # Fallback: sort by credibility and take top 3
-                sorted_by_cred = sorted(
-                    range(len(raw_results)),
-                    key=lambda x: raw_results[x].get("credibility_score", 0.5),
-                    reverse=True,
+                logger.info(
+                    "🗜️ Compressed context: %s -> %s tokens",
+                    total,
+                    sum(count_tokens(passages[i]) for i in indices),
                 )
-                return sorted_by_cred[:3]
+        return self._fit_context(passages, indices, max_tokens, raw_results)
+
+    @staticmethod
+    def _fit_context(
+        passages: List[str],
+        indices: List[int],
+        max_tokens: int,
+        raw_results: Optional[List[Dict]] = None,
+    ) -> Tuple[str, List[int]]:
+        """
+        Build numbered context from whole passages within a token budget.
 
-            # Limit to top 5 relevant to avoid context overflow
-            return valid_indices[:5]
+        Passages are kept in order until the next one would overflow, so
+        citations never point at a passage cut mid-way. With raw_results,
+        the kept passages are then put in _stable_order. Returns the context
+        and the indices actually included.
+        """
+        kept, used = [], 0
+        for i in indices:
+            cost = count_tokens(passages[i]) + 4  # "[n] " marker + separator
+            if kept and used + cost > max_tokens:
+                break
+            kept.append(i)
+            used += cost
+        if raw_results is not None:
+            kept = DSPyPipeline._stable_order(kept, raw_results)
+
+        if used > max_tokens:  # A single passage larger than the budget
+            # Clip first so the discarded tail is never normalized or encoded
+            clipped = [passages[kept[0]][: max_tokens * 8]]
+            context = DSPyPipeline._numbered_context(clipped, [0])
+            return truncate_to_tokens(context, max_tokens), kept
+        return DSPyPipeline._numbered_context(passages, kept), kept
+
+    def _warn_short_prefix(self, context: str) -> None:
+        """Warn once when the context is too short for provider prefix caching."""
+        if self._prefix_warned:
+            return
+        # Providers only cache prompts of 1024+ tokens
+        tokens = count_tokens(context)
+        if tokens < 1024:
+            self._prefix_warned = True
+            logger.warning(
+                "⚠️ Answer context is ~%s tokens; provider prompt caching needs 1024+",
+                tokens,
+            )
+
+    @staticmethod
+    def _prefilter(
+        question: str, passages: List[str], raw_results: List[Dict]
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        Keep the top RERANK_PREFILTER_K passages by BM25 + credibility.
+
+        Cheap lexical scoring trims what the LLM reranker has to read;
+        survivors keep their retrieval order.
+        """
+        k = settings.RERANK_PREFILTER_K
+        if k <= 0 or len(passages) <= k or len(raw_results) != len(passages):
+            return passages, raw_results
+
+        scores = bm25_scores(question, passages)
+        creds = DSPyPipeline._credibilities(raw_results, len(passages))
+        top = max(scores) or 1.0
+        final = [0.7 * score / top + 0.3 * cred for score, cred in zip(scores, creds)]
+        keep = sorted(heapq.nlargest(k, range(len(passages)), key=final.__getitem__))
+        logger.info("⚡ Prefiltered %s -> %s passages (BM25)", len(passages), len(keep))
+        return [passages[i] for i in keep], [raw_results[i] for i in keep]
+
+    @staticmethod
+    def _credibilities(raw_results: List[Dict], n: int) -> List[float]:
+        """Credibility scores for the first n results, defaulting to 0.5."""
+        creds = [r.get("credibility_score", 0.5) for r in raw_results[:n]]
+        return creds + [0.5] * (n - len(creds))
+
+    @staticmethod
+    def _rerank_context(passages: List[str], raw_results: List[Dict]) -> str:
+        """Format context for ranking (index + credibility + preview)."""
+        creds = DSPyPipeline._credibilities(raw_results, len(passages))
+        return "\n".join(
+            f"[{i}] (credibility: {cred:.2f}) {p[:180]}..."
+            for i, (p, cred) in enumerate(zip(passages, creds))
+        )
+
+    @staticmethod
+    def _select_indices(
+        indices_str: str, passages: List[str], raw_results: List[Dict]
+    ) -> List[int]:
+        """Parse the ranker's output into valid passage indices, best first."""
+        # Parse indices: "1, 3, 5" / "[1, 3, 5]" / "2 and 4" -> [1, 3, 5]
+        indices = [int(m) for m in _IDX_RE.findall(indices_str)]
+
+        # Filter valid indices
+        valid_indices = [i for i in indices if 0 <= i < len(passages)]
+
+        if not valid_indices:
+            logger.warning(
+                "Reranker returned no valid indices, using top by credibility"
+            )
+            # Fallback: top 3 by credibility
+            creds = DSPyPipeline._credibilities(raw_results, len(passages))
+            top_by_cred = heapq.nlargest(3, range(len(creds)), key=creds.__getitem__)
+            return top_by_cred
+
+        # Limit to top 5 relevant to avoid context overflow
+        return valid_indices[:5]
+
+    def _rerank_passages(
+        self,
+        question: str,
+        passages: List[str],
+        raw_results: List[Dict],
+    ) -> List[int]:
+        """Rerank passages factoring in both relevance and credibility."""
+        if not passages:
+            return []
+
+        context_str = self._rerank_context(passages, raw_results)
+
+        try:
+            result = self._cached_call(
+                "ContextRanker",
+                self.ranker,
+                self._rerank_cache,
+                query=question,
+                context=context_str,
+            )
+            return self._select_indices(result.selected_indices, passages, raw_results)
+
+        except Exception as e:
+            logger.error("Reranking failed: %s", e)
+            return list(range(min(5, len(passages))))  # Fallback to top 5
+
+    async def _arerank_passages(
+        self, question: str, passages: List[str], raw_results: List[Dict]
+    ) -> List[int]:
+        """Async _rerank_passages."""
+        if not passages:
+            return []
+
+        context_str = self._rerank_context(passages, raw_results)
+
+        try:
+            result = await self._acached_call(
+                "ContextRanker",
+                self._aranker,
+                self._rerank_cache,
+                query=question,
+                context=context_str,
+            )
+            return self._select_indices(result.selected_indices, passages, raw_results)
 
         except Exception as e:
-            logger.error(f"Reranking failed: {e}")
+            logger.error("Reranking failed: %s", e)
             return list(range(min(5, len(passages))))  # Fallback to top 5
 
+    @staticmethod
+    def _candidate_passages(passages: List[str], raw_results: List[Dict]) -> str:
+        """JSON-encode passages (index + credibility + text) for FusedQA."""
+        creds = DSPyPipeline._credibilities(raw_results, len(passages))
+        candidates = [
+            {
+                "idx": i,
+                "credibility": round(cred, 2),
+                "text": clean_text(p[:800])[:400],
+            }
+            for i, (p, cred) in enumerate(zip(passages, creds))
+        ]
+        return orjson.dumps(candidates).decode()
+
+    @staticmethod
+    def _remap_citations(
+        answer: str, indices: List[int], n_passages: int
+    ) -> Tuple[str, List[int]]:
+        """
+        Renumber candidate-index citations to positions in the source list.
+
+        FusedQA cites passages by candidate idx; responses number sources
+        0..n in the order of ``indices``. Cited passages missing from
+        ``indices`` are appended so every citation resolves to a source.
+        """
+        indices = list(indices)
+
+        def renumber(match: re.Match) -> str:
+            idx = int(match.group(1))
+            if not 0 <= idx < n_passages:
+                return match.group(0)
+            if idx not in indices:
+                indices.append(idx)
+            return f"[{indices.index(idx)}]"
+
+        # Skip subscripts like arr[0] inside code
+        answer = re.sub(r"(?<!\w)\[(\d+)\]", renumber, answer)
+        return answer, indices
+
+    def _fused_response(
+        self,
+        question: str,
+        result: dspy.Prediction,
+        passages: List[str],
+        raw_results: List[Dict],
+    ) -> Dict:
+        """Build response dict from a FusedQA prediction."""
+        indices = self._stable_order(
+            self._select_indices(result.selected_indices, passages, raw_results),
+            raw_results,
+        )
+        answer, indices = self._remap_citations(result.answer, indices, len(passages))
+        response = self._build_response(question, result, indices, raw_results)
+        response["answer"] = answer
+        return response
+
+    def _fused_answer_multi(
+        self,
+        questions: List[str],
+        live: List[Tuple[int, List[str], List[Dict]]],
+        responses: List[Optional[Dict]],
+    ) -> List[Tuple[int, List[str], List[Dict]]]:
+        """
+        Batched _fused_answer: fills responses for the questions it answers.
+
+        Returns the entries whose fused call failed, for the staged path.
+        """
+        results = self._batched_call(
+            "FusedQA",
+            self.fused,
+            self._answer_cache,
+            [
+                {
+                    "candidate_passages": self._candidate_passages(p, r),
+                    "question": questions[i],
+                }
+                for i, p, r in live
+            ],
+        )
+        staged = []
+        for (i, passages, raw_results), result in zip(live, results):
+            try:
+                if result is None:
+                    raise RuntimeError("batched FusedQA call failed")
+                responses[i] = self._fused_response(
+                    questions[i], result, passages, raw_results
+                )
+            except Exception as e:
+                logger.warning("Fused LLM call failed, using staged calls: %s", e)
+                staged.append((i, passages, raw_results))
+        return staged
+
+    def _fused_answer(
+        self, question: str, passages: List[str], raw_results: List[Dict]
+    ) -> Optional[Dict]:
+        """Rerank and answer in one LLM call; None means use the staged path."""
+        try:
+            start_llm = time.time()
+            result = self._cached_call(
+                "FusedQA",
+                self.fused,
+                self._answer_cache,
+                candidate_passages=self._candidate_passages(passages, raw_results),
+                question=question,
+            )
+            logger.info("✅ Fused LLM call responded in %.2fs", time.time() - start_llm)
+            return self._fused_response(question, result, passages, raw_results)
+
+        except Exception as e:
+            logger.warning("Fused LLM call failed, using staged calls: %s", e)
+            return None
+
+    async def _afused_answer(
+        self, question: str, passages: List[str], raw_results: List[Dict]
+    ) -> Optional[Dict]:
+        """Async _fused_answer."""
+        try:
+            start_llm = time.time()
+            result = await self._acached_call(
+                "FusedQA",
+                self._afused,
+                self._answer_cache,
+                candidate_passages=self._candidate_passages(passages, raw_results),
+                question=question,
+            )
+            logger.info("✅ Fused LLM call responded in %.2fs", time.time() - start_llm)
+            return self._fused_response(question, result, passages, raw_results)
+
+        except Exception as e:
+            logger.warning("Fused LLM call failed, using staged calls: %s", e)
+            return None
+
     def _empty_result(self, question: str) -> Dict:
         """Return empty result when no passages found."""
         return {
@@ -168,33 +991,70 @@ class DSPyPipeline:
             "sources": [],
         }
 
+    def _error_result(self, question: str, error: Exception) -> Dict:
+        """Return error result when the pipeline fails."""
+        return {
+            "question": question,
+            "answer": f"Error: {str(error)}",
+            "context": [],
+            "confidence": 0.0,
+        }
+
     def _extract_confidence(self, result) -> float:
-        """Extract confidence score from result."""
-        try:
-            return float(result.confidence.split()[0])
-        except (ValueError, AttributeError, IndexError):
+        """
+        Confidence score from result, clamped to [0, 1].
+
+        Signatures type confidence as float, so the adapter normally parses
+        it; free-form strings ("0.85 (high)") are still handled for safety.
+        """
+        confidence = getattr(result, "confidence", None)
+        if isinstance(confidence, (int, float)):
+            return max(0.0, min(1.0, float(confidence)))
+        match = _CONF_RE.search(str(confidence or ""))
+        if not match:
             return 0.7
+        value = float(match.group(1)) / (100 if match.group(2) else 1)
+        return max(0.0, min(1.0, value))
 
-    def _build_response(self, question: str, result, indices: List[int]) -> Dict:
-        """Build response dict using selected indices."""
-        raw_results = getattr(self.retriever, "_last_results", [])
+    def _build_response(
+        self,
+        question: str,
+        result,
+        indices: List[int],
+        raw_results: List[Dict],
+        include_context: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Build response dict using selected indices.
 
-        context_objects = []
-        for i in indices:
-            if i < len(raw_results):
-                raw = raw_results[i]
-                context_objects.append(
-                    {
-                        "text": raw.get("content", "")[:500],
-                        "url": raw.get("url", ""),
-                        "source": raw.get("engine", "searxng"),
-                        "title": raw.get("title", ""),
-                        "credibility_score": raw.get("credibility_score", 0.5),
-                        "credibility_category": raw.get(
-                            "credibility_category", "general"
-                        ),
-                    }
-                )
+        include_context defaults to the current request's flag; when False
+        the context list is never built and context is None.
+        """
+        if include_context is None:
+            include_context = _INCLUDE_CONTEXT.get()
+        n = len(raw_results)
+        raws = [raw_results[i] for i in indices if i < n]
+        if not include_context:
+            return {
+                "question": question,
+                "answer": result.answer,
+                "context": None,
+                "confidence": self._extract_confidence(result),
+                "sources": [raw["url"] for raw in raws if raw.get("url")],
+                "model_used": getattr(self._active_lm(), "model", self._model_name),
+            }
+
+        context_objects = [
+            {
+                "text": raw.get("content", "")[:500],
+                "url": raw.get("url", ""),
+                "source": raw.get("engine", "searxng"),
+                "title": raw.get("title", ""),
+                "credibility_score": raw.get("credibility_score", 0.5),
+                "credibility_category": raw.get("credibility_category", "general"),
+            }
+            for raw in raws
+        ]
 
         return {
             "question": question,
@@ -202,48 +1062,65 @@ class DSPyPipeline:
             "context": context_objects,
             "confidence": self._extract_confidence(result),
             "sources": [c["url"] for c in context_objects if c["url"]],
+            "model_used": getattr(self._active_lm(), "model", self._model_name),
         }
 
     def _is_complex_query(self, query: str) -> bool:
         """Check if query is complex enough to warrant decomposition."""
-        complex_indicators = [
-            "compare",
-            "vs",
-            "versus",
-            "difference between",
-            "pros and cons",
-            "advantages and disadvantages",
-            "how does",
-            "why does",
-            "explain the relationship",
-            "what are the",
-            " and ",
-            "best practices for",
+        return _COMPLEX_RE.search(query.lower()) is not None
+
+    @staticmethod
+    def _parse_sub_queries(sub_queries_str: str, query: str) -> List[str]:
+        """Parse newline-separated sub-queries, capped at 4."""
+        sub_queries = [
+            q.strip()
+            for q in sub_queries_str.split("\n")
+            if q.strip() and len(q.strip()) > 5
         ]
-        query_lower = query.lower()
-        return any(indicator in query_lower for indicator in complex_indicators)
+        return sub_queries[:4] if sub_queries else [query]
 
     def _decompose_query(self, query: str) -> List[str]:
         """Decompose complex query into sub-queries."""
         try:
-            with dspy.context(lm=self._lm):
-                result = self.decomposer(query=query)
-
-            # Parse sub-queries (newline-separated)
-            sub_queries = [
-                q.strip()
-                for q in result.sub_queries.split("\n")
-                if q.strip() and len(q.strip()) > 5
-            ]
+            result = self._cached_call(
+                "QueryDecomposer", self.decomposer, self._decompose_cache, query=query
+            )
+            return self._parse_sub_queries(result.sub_queries, query)
+
+        except Exception as e:
+            logger.error("Query decomposition failed: %s", e)
+            return [query]
 
-            # Limit to 4 sub-queries max
-            return sub_queries[:4] if sub_queries else [query]
+    async def _adecompose_query(self, query: str) -> List[str]:
+        """Async _decompose_query."""
+        try:
+            result = await self._acached_call(
+                "QueryDecomposer",
+                self._adecomposer,
+                self._decompose_cache,
+                query=query,
+            )
+            return self._parse_sub_queries(result.sub_queries, query)
 
         except Exception as e:
-            logger.error(f"Query decomposition failed: {e}")
+            logger.error("Query decomposition failed: %s", e)
             return [query]
 
-    def complex_search(self, question: str) -> Dict:
+    @staticmethod
+    def _dedupe_by_url(
+        all_raw_results: List[Dict], all_passages: List[str], limit: int = 15
+    ) -> Tuple[List[Dict], List[str]]:
+        """Deduplicate aligned raw results/passages by URL, keeping first seen."""
+        bucket: Dict[str, Tuple[Dict, str]] = {}
+        for raw, passage in zip(all_raw_results, all_passages):
+            bucket.setdefault(raw.get("url", ""), (raw, passage))
+            if len(bucket) >= limit:
+                break
+        unique_raw = [raw for raw, _ in bucket.values()]
+        unique_passages = [passage for _, passage in bucket.values()]
+        return unique_raw, unique_passages
+
+    def complex_search(self, question: str, include_context: bool = True) -> Dict:
         """
         Search with automatic query decomposition for complex questions.
 
@@ -251,49 +1128,137 @@ class DSPyPipeline:
         then synthesizes a comprehensive answer.
         """
         if not self._is_complex_query(question):
-            return self.search_and_answer(question)
+            return self.search_and_answer(question, include_context)
+
+        with self._context_option(include_context):
+            cached = self._semantic_lookup(question)
+            if cached is not None:
+                return cached
+            return self._semantic_store(question, self._complex_search(question))
+
+    def _complex_search(self, question: str) -> Dict:
+        """Uncached complex_search."""
+        logger.info("🔀 Complex query detected, decomposing: %s...", question[:50])
 
-        logger.info(f"🔀 Complex query detected, decomposing: {question[:50]}...")
         sub_queries = self._decompose_query(question)
-        logger.info(f"📋 Decomposed into {len(sub_queries)} sub-queries")
+        logger.info("📋 Decomposed into %s sub-queries", len(sub_queries))
+        logger.info("🔍 Sub-queries: %s", sub_queries)
+
+        # Sub-query retrievals run in parallel
+        with ThreadPoolExecutor(max_workers=max(1, len(sub_queries))) as pool:
+            retrievals = list(pool.map(self.retriever.retrieve, sub_queries))
 
         # Collect passages from all sub-queries
         all_passages = []
         all_raw_results = []
 
-        for sq in sub_queries:
-            logger.info(f"🔍 Sub-query: {sq}")
-            passages = self.retriever(sq)
+        for passages, raw_results in retrievals:
             all_passages.extend(passages)
-            all_raw_results.extend(getattr(self.retriever, "_last_results", []))
+            all_raw_results.extend(raw_results)
 
-        # Deduplicate by URL
-        seen_urls = set()
-        unique_raw = []
-        unique_passages = []
-        for raw, passage in zip(all_raw_results, all_passages):
-            url = raw.get("url", "")
-            if url not in seen_urls:
-                seen_urls.add(url)
-                unique_raw.append(raw)
-                unique_passages.append(passage)
-
-        # Store for reranking
-        self.retriever._last_results = unique_raw[:15]
+        unique_raw, unique_passages = self._dedupe_by_url(all_raw_results, all_passages)
 
         if not unique_passages:
             return self._empty_result(question)
 
+        unique_passages, unique_raw = self._prefilter(
+            question, unique_passages, unique_raw
+        )
+
+        if self._fuse_stages:
+            response = self._fused_answer(question, unique_passages, unique_raw)
+            if response is not None:
+                return response
+
         # Rerank combined results
-        selected_indices = self._rerank_passages(question, unique_passages[:15])
+        selected_indices = self._rerank_passages(question, unique_passages, unique_raw)
 
         # Synthesize
-        ranked_passages = [unique_passages[i] for i in selected_indices]
-        numbered_context = "\n\n".join(
-            [f"[{idx}] {p}" for idx, p in enumerate(ranked_passages)]
+        numbered_context, selected_indices = self._build_context(
+            question,
+            unique_passages,
+            selected_indices,
+            settings.COMPLEX_CONTEXT_TOKENS,
+            unique_raw,
+        )
+        self._warn_short_prefix(numbered_context)
+
+        result = self._cached_call(
+            "SearchQA",
+            self.answer,
+            self._answer_cache,
+            context=numbered_context,
+            question=question,
+        )
+
+        return self._build_response(question, result, selected_indices, unique_raw)
+
+    async def acomplex_search(
+        self, question: str, include_context: bool = True
+    ) -> Dict:
+        """
+        Async complex_search.
+
+        Sub-query retrievals are issued concurrently, so the retrieval phase
+        costs roughly one SearXNG round-trip instead of one per sub-query.
+        """
+        if not self._is_complex_query(question):
+            return await self.asearch_and_answer(question, include_context)
+
+        with self._context_option(include_context):
+            cached = await self._asemantic_lookup(question)
+            if cached is not None:
+                return cached
+            result = await self._acomplex_search(question)
+            return await self._asemantic_store(question, result)
+
+    async def _acomplex_search(self, question: str) -> Dict:
+        """Uncached acomplex_search."""
+        logger.info("🔀 Complex query detected, decomposing: %s...", question[:50])
+
+        sub_queries = await self._adecompose_query(question)
+        logger.info("📋 Decomposed into %s sub-queries", len(sub_queries))
+
+        retrievals = await asyncio.gather(*[self._aretrieve(sq) for sq in sub_queries])
+
+        all_passages = []
+        all_raw_results = []
+        for passages, raw_results in retrievals:
+            all_passages.extend(passages)
+            all_raw_results.extend(raw_results)
+
+        unique_raw, unique_passages = self._dedupe_by_url(all_raw_results, all_passages)
+
+        if not unique_passages:
+            return self._empty_result(question)
+
+        unique_passages, unique_raw = self._prefilter(
+            question, unique_passages, unique_raw
+        )
+
+        if self._fuse_stages:
+            response = await self._afused_answer(question, unique_passages, unique_raw)
+            if response is not None:
+                return response
+
+        selected_indices = await self._arerank_passages(
+            question, unique_passages, unique_raw
         )
+        numbered_context, selected_indices = self._build_context(
+            question,
+            unique_passages,
+            selected_indices,
+            settings.COMPLEX_CONTEXT_TOKENS,
+            unique_raw,
+        )
+        self._warn_short_prefix(numbered_context)
 
-        with dspy.context(lm=self._lm):
-            result = self.answer(context=numbered_context[:3500], question=question)
+        result = await self._acached_call(
+            "SearchQA",
+            self._aanswer,
+            self._answer_cache,
+            context=numbered_context,
+            question=question,
+        )
 
-        return self._build_response(question, result, selected_indices)
+        return self._build_response(question, result, selected_indices, unique_raw)
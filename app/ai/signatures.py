@@ -34,7 +34,7 @@ class SearchQA(dspy.Signature):
             "```python\ncode here\n```"
         )
     )
-    confidence = dspy.OutputField(desc="Confidence score 0-1")
+    confidence: float = dspy.OutputField(desc="Confidence score 0.0-1.0")
 
 
 class ContextRanker(dspy.Signature):
@@ -52,6 +52,32 @@ class ContextRanker(dspy.Signature):
     )
 
 
+class FusedQA(dspy.Signature):
+    """Select the most relevant, credible passages and answer from them in one step."""
+
+    candidate_passages = dspy.InputField(
+        desc=(
+            "JSON list of candidate passages: "
+            '[{"idx": 0, "credibility": 0.85, "text": "..."}, ...]'
+        )
+    )
+    question = dspy.InputField(desc="The user's question")
+    selected_indices = dspy.OutputField(
+        desc=(
+            "Comma-separated idx values of the passages used in the answer. "
+            "Prefer high-credibility sources. Example: '1, 3, 5'"
+        )
+    )
+    answer = dspy.OutputField(
+        desc=(
+            "A comprehensive, well-structured answer using ## headers, bullet points, "
+            "**bold** key terms and fenced code blocks with a language. "
+            "Cite passages inline by their idx, e.g. [1], [3]"
+        )
+    )
+    confidence: float = dspy.OutputField(desc="Confidence score 0.0-1.0")
+
+
 class QueryDecomposer(dspy.Signature):
     """Break complex queries into focused sub-queries for better search coverage."""
 
@@ -4,7 +4,15 @@ API Module
 REST API routes for SearchFlow.
 """
 
-from app.api.models import ExportRequest, SearchRequest, SearchResult
+from app.api.models import BatchJob, ExportRequest, SearchRequest, SearchResult
+from app.api.responses import ORJSONResponse
 from app.api.routes import router
 
-__all__ = ["router", "SearchRequest", "SearchResult", "ExportRequest"]
+__all__ = [
+    "router",
+    "SearchRequest",
+    "SearchResult",
+    "ExportRequest",
+    "BatchJob",
+    "ORJSONResponse",
+]
@@ -5,19 +5,36 @@ API endpoints for structured output (JSON/Markdown).
 Single Responsibility: Only handles export endpoints.
 """
 
+import asyncio
 import logging
+import uuid
+from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import PlainTextResponse
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from app.api.models import ExportRequest
-from app.output import format_as_json, format_as_markdown
+from app.api.models import BatchJob, ExportRequest
+from app.core.config import settings
+from app.core.tasks import run_in_background
+from app.output import JsonFormatter, format_as_json, format_as_markdown
 from app.services import get_search_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["export"])
 
+# Batch export jobs by id (in-process; finished jobs expire after BATCH_JOB_TTL)
+_batch_jobs: TTLCache = TTLCache(maxsize=1024, ttl=settings.BATCH_JOB_TTL)
+
+
+def _markdown_response(markdown: bytes, filename: str) -> Response:
+    """Inline text/markdown response from pre-encoded UTF-8 bytes."""
+    return Response(
+        content=markdown,
+        media_type="text/markdown",
+        headers={"Content-Disposition": f"inline; filename={filename}"},
+    )
+
 
 @router.post("/search/json")
 async def search_json(request: ExportRequest):
@@ -36,13 +53,16 @@ async def search_json(request: ExportRequest):
             skip_cache=request.skip_cache,
             include_context=request.include_context,
         )
-        return format_as_json(result)
+        # Serialized straight to bytes; no second encode in the response
+        return Response(
+            JsonFormatter.format_bytes(result), media_type="application/json"
+        )
 
     except ValueError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         raise HTTPException(status_code=503, detail="Search service not configured.")
     except Exception as e:
-        logger.error(f"JSON export failed: {e}")
+        logger.error("JSON export failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -63,17 +83,102 @@ async def search_markdown(request: ExportRequest):
             skip_cache=request.skip_cache,
             include_context=request.include_context,
         )
-        markdown = format_as_markdown(result)
-
-        return PlainTextResponse(
-            content=markdown,
-            media_type="text/markdown",
-            headers={"Content-Disposition": "inline; filename=search_result.md"},
-        )
+        # Encode once here; Response passes bytes through untouched
+        markdown = format_as_markdown(result).encode()
+        return _markdown_response(markdown, "search_result.md")
 
     except ValueError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         raise HTTPException(status_code=503, detail="Search service not configured.")
     except Exception as e:
-        logger.error(f"Markdown export failed: {e}")
+        logger.error("Markdown export failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _run_batch(job: Dict[str, Any], requests: List[ExportRequest]) -> None:
+    """Answer a batch export job's queries and record the outcome on the job."""
+    try:
+        service = await get_search_service()
+        # One search_batch call per option combination, so one request's
+        # skip_cache or include_context never applies to the others
+        groups: Dict[Tuple[bool, bool], List[int]] = {}
+        for i, r in enumerate(requests):
+            groups.setdefault((r.skip_cache, r.include_context), []).append(i)
+
+        answers = await asyncio.gather(
+            *(
+                service.search_batch(
+                    [requests[i].query for i in indices],
+                    skip_cache=skip_cache,
+                    include_context=include_context,
+                )
+                for (skip_cache, include_context), indices in groups.items()
+            )
+        )
+        results: List[Dict[str, Any]] = [{}] * len(requests)
+        for indices, group_results in zip(groups.values(), answers):
+            for i, result in zip(indices, group_results):
+                results[i] = result
+        job["results"] = results
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error("Batch export %s failed: %s", job["job_id"], e)
+        job["error"] = str(e)
+        job["status"] = "failed"
+
+
+@router.post("/search/batch", response_model=BatchJob, status_code=202)
+async def search_batch(requests: List[ExportRequest]):
+    """
+    Submit many queries as one background export job.
+
+    Suited to bulk, latency-tolerant workloads:
+    - Returns a job id immediately
+    - Uncached queries share batched rerank/answer LLM stages
+    - Fetch results via GET /api/v1/search/batch/{job_id}
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="At least one query is required")
+    if len(requests) > settings.BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BATCH_MAX_QUERIES} queries per batch",
+        )
+
+    job_id = uuid.uuid4().hex
+    job: Dict[str, Any] = {
+        "job_id": job_id,
+        "status": "pending",
+        "total": len(requests),
+    }
+    # Tracked by app.core.tasks, so TTL eviction of the job can't drop it
+    run_in_background(_run_batch(job, requests), name=f"batch-{job_id}")
+    _batch_jobs[job_id] = job
+    return BatchJob(**job)
+
+
+@router.get("/search/batch/{job_id}")
+async def get_search_batch(
+    job_id: str,
+    format: str = Query("json", pattern="^(json|markdown)$"),
+):
+    """
+    Get a batch export job's status, and its results once completed.
+
+    With format=markdown, a completed job is returned as one Markdown
+    document (one section per query).
+    """
+    job = _batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    if job["status"] != "completed":
+        return BatchJob(**job)
+
+    if format == "markdown":
+        markdown = b"\n\n---\n\n".join(
+            format_as_markdown(r).encode() for r in job["results"]
+        )
+        return _markdown_response(markdown, "search_batch.md")
+
+    return BatchJob(**{**job, "results": [format_as_json(r) for r in job["results"]]})
@@ -5,15 +5,20 @@ Pydantic models for API requests and responses.
 Single Responsibility: Only defines data structures.
 """
 
-from typing import List, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, StringConstraints
+
+# Stripped and length-checked by pydantic-core while the body is parsed
+QueryText = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=500)
+]
 
 
 class SearchRequest(BaseModel):
     """Search request model."""
 
-    query: str
+    query: QueryText
     include_context: bool = True
     skip_cache: bool = False
 
@@ -29,9 +34,15 @@ class SearchResult(BaseModel):
     cached: bool = False
 
 
-class ExportRequest(BaseModel):
-    """Export request model for JSON/Markdown output."""
+class ExportRequest(SearchRequest):
+    """Export request model for JSON/Markdown output (same fields as search)."""
 
-    query: str
-    skip_cache: bool = False
-    include_context: bool = True
+
+class BatchJob(BaseModel):
+    """Batch export job status model."""
+
+    job_id: str
+    status: Literal["pending", "completed", "failed"]
+    total: int
+    results: Optional[List[Dict[str, Any]]] = None
+    error: Optional[str] = None
@@ -0,0 +1,18 @@
+"""
+API Responses
+
+Response classes for API endpoints.
+Single Responsibility: Only handles response body serialization.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (several times faster than json)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
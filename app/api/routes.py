@@ -6,25 +6,93 @@ Uses SearchService for business logic (DRY/SOLID compliant).
 """
 
 import asyncio
-import json
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import ValidationError
 from sse_starlette.sse import EventSourceResponse
 
 from app.api.models import SearchRequest, SearchResult
+from app.api.responses import ORJSONResponse
 from app.cache.redis_client import get_cache_client
+from app.core.config import settings
 from app.services import get_search_service
+from app.services.suggestions import FALLBACK_SUGGESTIONS, get_suggestion_service
+from app.utils.greeting import is_greeting
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["search"])
 
+# SearchResult fields with their defaults (None where required)
+_RESULT_FIELDS = tuple(
+    (name, None if field.is_required() else field.default)
+    for name, field in SearchResult.model_fields.items()
+)
+
+# Fallback suggestions body, pre-serialized without its closing brace so the
+# error path only appends the error message (LLM outages hit it repeatedly)
+_FALLBACK_SUGGESTIONS_PREFIX = orjson.dumps(
+    {"suggestions": FALLBACK_SUGGESTIONS, "personalized": False}
+)[:-1]
+
+
+async def _coalesce_tokens(
+    events: AsyncIterator[Dict[str, Any]],
+    max_chars: int = 8192,
+    interval: float = 0.025,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Merge bursts of token events into fewer, larger ones.
+
+    Buffered tokens are flushed once they reach max_chars, once interval
+    seconds have passed since the last flush (the first token goes out
+    at once), or before any other event.
+    """
+    loop = asyncio.get_running_loop()
+    buffer: List[str] = []
+    size, last_flush = 0, float("-inf")
+
+    async for event in events:
+        if event.get("type") == "token":
+            content = event.get("content", "")
+            buffer.append(content)
+            size += len(content)
+            now = loop.time()
+            if size >= max_chars or now - last_flush >= interval:
+                yield {"type": "token", "content": "".join(buffer)}
+                buffer, size, last_flush = [], 0, now
+            continue
+
+        if buffer:
+            yield {"type": "token", "content": "".join(buffer)}
+            buffer, size = [], 0
+        yield event
+
+    if buffer:
+        yield {"type": "token", "content": "".join(buffer)}
+
+
+def _sse_data(payload: dict) -> str:
+    """Serialize an SSE data payload (orjson; SSE frames need str)."""
+    return orjson.dumps(payload).decode()
+
 
 @router.post("/search", response_model=SearchResult)
-async def search(request: SearchRequest) -> SearchResult:
+async def search(request: SearchRequest) -> Response:
     """Search and answer using DSPy + SearXNG."""
+    # Default-shaped (with context) responses are cached as their final
+    # bytes, so repeat hits skip deserializing and re-encoding entirely
+    cache = await get_cache_client()
+    cache_key = cache.key_for(request.query)
+    store_body = request.include_context and not is_greeting(request.query)
+    if store_body and not request.skip_cache:
+        body = await cache.get_raw(cache_key)
+        if body is not None:
+            return Response(body, media_type="application/json")
+
     try:
         service = await get_search_service()
         result = await service.search(
@@ -32,13 +100,18 @@ async def search(request: SearchRequest) -> SearchResult:
             skip_cache=request.skip_cache,
             include_context=request.include_context,
         )
-        return SearchResult(**result)
+        # SearchResult stays the documented schema, but the payload is
+        # serialized directly instead of validated and jsonable_encoded
+        payload = {name: result.get(name, default) for name, default in _RESULT_FIELDS}
+        if store_body and payload["context"] is not None:
+            await cache.set_raw(cache_key, orjson.dumps({**payload, "cached": True}))
+        return ORJSONResponse(payload)
 
     except ValueError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         raise HTTPException(status_code=503, detail="Search service not configured.")
     except Exception as e:
-        logger.error(f"Search failed: {e}")
+        logger.error("Search failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -48,39 +121,43 @@ async def search_stream(request: Request) -> EventSourceResponse:
 
     async def event_generator() -> AsyncGenerator[dict, None]:
         try:
-            body = await request.json()
-            query = body.get("query", "")
-            skip_cache = body.get("skip_cache", False)
-            # Model is controlled by .env, not frontend
+            # Parse, strip and validate in one pass (pydantic-core)
+            body = SearchRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"]) or "body"
+            yield {
+                "event": "error",
+                "data": _sse_data({"message": f"Invalid {field}: {error['msg']}"}),
+            }
+            return
 
-            if not query:
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"message": "Query is required"}),
-                }
-                return
+        try:
+            query = body.query
+            skip_cache = body.skip_cache
+            # Model is controlled by .env, not frontend
 
-            logger.info(f"Streaming search: {query}")
+            logger.info("Streaming search: %s", query)
             service = await get_search_service()
 
-            async for event in service.search_streaming(query, skip_cache):
+            events = _coalesce_tokens(service.search_streaming(query, skip_cache))
+            async for event in events:
                 event_type = event.get("type", "status")
 
                 if event_type == "token":
                     yield {
                         "event": "token",
-                        "data": json.dumps({"content": event.get("content", "")}),
+                        "data": _sse_data({"content": event.get("content", "")}),
                     }
                 elif event_type == "status":
                     yield {
                         "event": "status",
-                        "data": json.dumps({"message": event.get("message", "")}),
+                        "data": _sse_data({"message": event.get("message", "")}),
                     }
-                    await asyncio.sleep(0.1)
                 elif event_type == "done":
                     yield {
                         "event": "done",
-                        "data": json.dumps(
+                        "data": _sse_data(
                             {
                                 "sources": event.get("sources", []),
                                 "context": event.get("context", []),
@@ -93,12 +170,12 @@ async def search_stream(request: Request) -> EventSourceResponse:
                 elif event_type == "error":
                     yield {
                         "event": "error",
-                        "data": json.dumps({"message": event.get("message", "")}),
+                        "data": _sse_data({"message": event.get("message", "")}),
                     }
 
         except Exception as e:
-            logger.error(f"Streaming search failed: {e}")
-            yield {"event": "error", "data": json.dumps({"message": str(e)})}
+            logger.error("Streaming search failed: %s", e)
+            yield {"event": "error", "data": _sse_data({"message": str(e)})}
 
     return EventSourceResponse(event_generator())
 
@@ -107,7 +184,7 @@ async def search_stream(request: Request) -> EventSourceResponse:
 async def search_health():
     """Health check for search functionality."""
     cache = await get_cache_client()
-    cache_stats = await cache.get_stats()
+    cache_stats = await cache.get_stats(max_age=settings.HEALTH_STATS_TTL)
     return {
         "status": "healthy",
         "searxng": "configured",
@@ -139,13 +216,17 @@ async def get_suggestions(request: Request):
     For returning users: Returns personalized suggestions based on history.
     """
     try:
-        from app.services.suggestions import get_suggestion_service
-
-        body = await request.json()
+        body = orjson.loads(await request.body())
         history = body.get("history", [])
 
-        service = get_suggestion_service()
-        suggestions = await service.generate_suggestions_async(history)
+        # Same history (e.g. tab refresh) -> cached suggestions, no LLM call
+        cache = await get_cache_client()
+        suggestions = await cache.get_suggestions(history)
+        if suggestions is None:
+            service = get_suggestion_service()
+            suggestions = await service.generate_suggestions_async(history)
+            if suggestions != list(FALLBACK_SUGGESTIONS):
+                await cache.set_suggestions(history, suggestions)
 
         return {
             "suggestions": suggestions,
@@ -153,16 +234,12 @@ async def get_suggestions(request: Request):
         }
 
     except Exception as e:
-        logger.error(f"Suggestions failed: {e}")
+        logger.error("Suggestions failed: %s", e)
         # Return fallback suggestions on error
-        return {
-            "suggestions": [
-                "What are the latest features in Next.js?",
-                "Explain quantum computing simply",
-                "Best practices for React performance",
-                "How does a transformer model work?",
-                "Compare Python vs Rust for backend",
-            ],
-            "personalized": False,
-            "error": str(e),
-        }
+        return Response(
+            content=_FALLBACK_SUGGESTIONS_PREFIX
+            + b',"error":'
+            + orjson.dumps(str(e))
+            + b"}",
+            media_type="application/json",
+        )
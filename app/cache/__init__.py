@@ -1,9 +1,11 @@
 """
 Cache Module
 
-Provides Redis-based caching for search results.
+Provides Redis-based caching for search results and a disk-backed
+semantic cache for near-duplicate questions.
 """
 
 from app.cache.redis_client import CacheClient, get_cache_client
+from app.cache.semantic import SemanticCache, get_semantic_cache
 
-__all__ = ["CacheClient", "get_cache_client"]
+__all__ = ["CacheClient", "get_cache_client", "SemanticCache", "get_semantic_cache"]
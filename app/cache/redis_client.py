@@ -6,11 +6,14 @@ Reduces LLM API costs and improves response times for repeated queries.
 """
 
 import hashlib
-import json
 import logging
-from typing import Any, Dict, Optional
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
+import orjson
 import redis.asyncio as redis
+from cachetools import TTLCache
 
 from app.core.config import settings
 
@@ -20,14 +23,23 @@ logger = logging.getLogger(__name__)
 _cache_client: Optional["CacheClient"] = None
 
 
+@lru_cache(maxsize=1024)
+def _query_hash(query: str) -> str:
+    """64-bit BLAKE2b of the normalized query (memoized for repeat queries)."""
+    # Normalize query: lowercase, strip whitespace
+    normalized = query.lower().strip()
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+
 class CacheClient:
     """
     Redis-based cache client for storing search results.
 
     Features:
     - Hash-based key generation for queries
+    - Short-lived in-process LRU in front of Redis for hot queries
     - TTL-based expiration
-    - JSON serialization for complex data
+    - orjson (de)serialization for complex data
     - Graceful fallback if Redis unavailable
     """
 
@@ -44,6 +56,12 @@ class CacheClient:
         self.enabled = settings.CACHE_ENABLED
         self._redis: Optional[redis.Redis] = None
         self._connected = False
+        # Query results only; kept short so other workers' writes show up soon
+        self._local: TTLCache = TTLCache(
+            maxsize=settings.LOCAL_CACHE_SIZE, ttl=settings.LOCAL_CACHE_TTL
+        )
+        self._stats: Optional[Dict[str, Any]] = None
+        self._stats_at = 0.0
 
     async def connect(self) -> bool:
         """
@@ -57,25 +75,29 @@ class CacheClient:
             return False
 
         try:
-            self._redis = redis.from_url(
+            # Blocking pool: callers wait for a free connection instead of
+            # erroring once the pool is exhausted. Raw bytes in and out:
+            # payloads go straight to/from orjson
+            pool = redis.BlockingConnectionPool.from_url(
                 self.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
             )
+            self._redis = redis.Redis.from_pool(pool)
             # Test connection
             await self._redis.ping()
             self._connected = True
-            logger.info(f"Connected to Redis at {self.redis_url}")
+            logger.info("Connected to Redis at %s", self.redis_url)
             return True
         except Exception as e:
-            logger.warning(f"Failed to connect to Redis: {e}")
+            logger.warning("Failed to connect to Redis: %s", e)
             self._connected = False
             return False
 
     async def disconnect(self) -> None:
         """Close Redis connection."""
         if self._redis:
-            await self._redis.close()
+            await self._redis.aclose()
             self._connected = False
             logger.info("Disconnected from Redis")
 
@@ -83,7 +105,7 @@ class CacheClient:
         """
         Generate cache key from query.
 
-        Uses SHA-256 hash of normalized query for consistent keys.
+        Uses a 64-bit BLAKE2b hash of the normalized query for consistent keys.
 
         Args:
             query: Search query string
@@ -91,11 +113,14 @@ class CacheClient:
         Returns:
             Cache key string
         """
-        # Normalize query: lowercase, strip whitespace
-        normalized = query.lower().strip()
-        # Generate hash
-        query_hash = hashlib.sha256(normalized.encode()).hexdigest()[:16]
-        return f"{self.prefix}query:{query_hash}"
+        return f"{self.prefix}query:{_query_hash(query)}"
+
+    def key_for(self, query: str) -> str:
+        """
+        Cache key for a query, to compute once and reuse across a request's
+        get_by_key/set_by_key calls.
+        """
+        return self._generate_key(query)
 
     async def get(self, query: str) -> Optional[Dict[str, Any]]:
         """
@@ -104,25 +129,42 @@ class CacheClient:
         Args:
             query: Search query string
 
+        Returns:
+            Cached result dict or None if not found
+        """
+        return await self.get_by_key(self._generate_key(query))
+
+    async def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached result by precomputed key (see key_for).
+
+        Args:
+            key: Cache key string
+
         Returns:
             Cached result dict or None if not found
         """
         if not self._connected or not self._redis:
             return None
 
+        local = self._local.get(key)
+        if local is not None:
+            logger.info("Local cache HIT: %s", key)
+            return local
+
         try:
-            key = self._generate_key(query)
             cached = await self._redis.get(key)
 
             if cached:
-                logger.info(f"Cache HIT for query: {query[:50]}...")
-                return json.loads(cached)
+                logger.info("Cache HIT: %s", key)
+                result = self._local[key] = orjson.loads(cached)
+                return result
             else:
-                logger.debug(f"Cache MISS for query: {query[:50]}...")
+                logger.debug("Cache MISS: %s", key)
                 return None
 
         except Exception as e:
-            logger.error(f"Cache get error: {e}")
+            logger.error("Cache get error: %s", e)
             return None
 
     async def set(self, query: str, result: Dict[str, Any]) -> bool:
@@ -133,6 +175,19 @@ class CacheClient:
             query: Search query string
             result: Result dict to cache
 
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        return await self.set_by_key(self._generate_key(query), result)
+
+    async def set_by_key(self, key: str, result: Dict[str, Any]) -> bool:
+        """
+        Store result in cache by precomputed key (see key_for).
+
+        Args:
+            key: Cache key string
+            result: Result dict to cache
+
         Returns:
             True if stored successfully, False otherwise
         """
@@ -140,7 +195,6 @@ class CacheClient:
             return False
 
         try:
-            key = self._generate_key(query)
             # Add cache metadata
             result_with_meta = {
                 **result,
@@ -150,13 +204,172 @@ class CacheClient:
             await self._redis.setex(
                 key,
                 self.ttl,
-                json.dumps(result_with_meta),
+                orjson.dumps(result_with_meta),
             )
-            logger.info(f"Cached result for query: {query[:50]}... (TTL: {self.ttl}s)")
+            self._local[key] = result_with_meta
+            logger.info("Cached result: %s (TTL: %ss)", key, self.ttl)
             return True
 
         except Exception as e:
-            logger.error(f"Cache set error: {e}")
+            logger.error("Cache set error: %s", e)
+            return False
+
+    async def get_many(self, queries: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached results for several queries in one MGET round-trip.
+
+        Args:
+            queries: Search query strings
+
+        Returns:
+            Dict of query -> cached result, for cache hits only
+        """
+        if not queries or not self._connected or not self._redis:
+            return {}
+
+        keys = {q: self._generate_key(q) for q in queries}
+        hits = {q: self._local[k] for q, k in keys.items() if k in self._local}
+        remote = [q for q in keys if q not in hits]
+        if not remote:
+            return hits
+
+        try:
+            values = await self._redis.mget([keys[q] for q in remote])
+            for query, value in zip(remote, values):
+                if value:
+                    hits[query] = self._local[keys[query]] = orjson.loads(value)
+            logger.info("Cache MGET: %s/%s hits", len(hits), len(queries))
+            return hits
+
+        except Exception as e:
+            logger.error("Cache get_many error: %s", e)
+            return {}
+
+    async def set_many(self, results: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Store several results in one pipelined round-trip.
+
+        Args:
+            results: Dict of query -> result dict to cache
+
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        if not results or not self._connected or not self._redis:
+            return False
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                entries = {}
+                for query, result in results.items():
+                    key = self._generate_key(query)
+                    entries[key] = {**result, "_cached": True, "_cache_key": key}
+                    pipe.setex(key, self.ttl, orjson.dumps(entries[key]))
+                await pipe.execute()
+            self._local.update(entries)
+            logger.info("Cached %s results (TTL: %ss)", len(results), self.ttl)
+            return True
+
+        except Exception as e:
+            logger.error("Cache set_many error: %s", e)
+            return False
+
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """
+        Get a stored response body by precomputed key (see key_for).
+
+        Args:
+            key: Cache key string
+
+        Returns:
+            Serialized JSON body, or None if not found
+        """
+        if not self._connected or not self._redis:
+            return None
+
+        try:
+            return await self._redis.get(f"{key}:body")
+        except Exception as e:
+            logger.error("Cache get error: %s", e)
+            return None
+
+    async def set_raw(self, key: str, body: bytes) -> bool:
+        """
+        Store a serialized response body, served verbatim on later hits.
+
+        Args:
+            key: Cache key string
+            body: Serialized JSON body
+
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        if not self._connected or not self._redis:
+            return False
+
+        try:
+            await self._redis.setex(f"{key}:body", self.ttl, body)
+            return True
+        except Exception as e:
+            logger.error("Cache set error: %s", e)
+            return False
+
+    def _suggestions_key(self, history: List[str]) -> str:
+        """
+        Generate suggestions cache key from search history.
+
+        Hashes the set of queries the suggestion LLM actually sees (first
+        10 entries, case- and whitespace-insensitive). Order is ignored:
+        the same recent queries reordered yield the same suggestions, so
+        they share one entry.
+        """
+        canonical = "\n".join(sorted({h.strip().lower() for h in history[:10]}))
+        history_hash = hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+        return f"{self.prefix}suggest:{history_hash}"
+
+    async def get_suggestions(self, history: List[str]) -> Optional[List[str]]:
+        """
+        Get cached suggestions for a search history.
+
+        Args:
+            history: User's past search queries (may be empty)
+
+        Returns:
+            Cached suggestions or None if not found
+        """
+        if not self._connected or not self._redis:
+            return None
+
+        try:
+            cached = await self._redis.get(self._suggestions_key(history))
+            return orjson.loads(cached) if cached else None
+        except Exception as e:
+            logger.error("Cache get error: %s", e)
+            return None
+
+    async def set_suggestions(self, history: List[str], suggestions: List[str]) -> bool:
+        """
+        Store suggestions for a search history.
+
+        Args:
+            history: User's past search queries (may be empty)
+            suggestions: Generated suggestions to cache
+
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        if not self._connected or not self._redis:
+            return False
+
+        try:
+            await self._redis.setex(
+                self._suggestions_key(history),
+                settings.SUGGESTIONS_CACHE_TTL,
+                orjson.dumps(suggestions),
+            )
+            return True
+        except Exception as e:
+            logger.error("Cache set error: %s", e)
             return False
 
     async def delete(self, query: str) -> bool:
@@ -174,11 +387,12 @@ class CacheClient:
 
         try:
             key = self._generate_key(query)
-            await self._redis.delete(key)
-            logger.info(f"Deleted cache for query: {query[:50]}...")
+            self._local.pop(key, None)
+            await self._redis.delete(key, f"{key}:body")
+            logger.info("Deleted cache for query: %s...", query[:50])
             return True
         except Exception as e:
-            logger.error(f"Cache delete error: {e}")
+            logger.error("Cache delete error: %s", e)
             return False
 
     async def clear_all(self) -> int:
@@ -191,6 +405,7 @@ class CacheClient:
         if not self._connected or not self._redis:
             return 0
 
+        self._local.clear()
         try:
             pattern = f"{self.prefix}*"
             keys = []
@@ -199,37 +414,50 @@ class CacheClient:
 
             if keys:
                 deleted = await self._redis.delete(*keys)
-                logger.info(f"Cleared {deleted} cached entries")
+                logger.info("Cleared %s cached entries", deleted)
                 return deleted
             return 0
 
         except Exception as e:
-            logger.error(f"Cache clear error: {e}")
+            logger.error("Cache clear error: %s", e)
             return 0
 
-    async def get_stats(self) -> Dict[str, Any]:
+    async def get_stats(self, max_age: float = 0.0) -> Dict[str, Any]:
         """
         Get cache statistics.
 
+        Args:
+            max_age: Serve stats fetched within this many seconds instead of
+                querying Redis again (for frequently probed health checks)
+
         Returns:
             Dict with cache stats
         """
         if not self._connected or not self._redis:
             return {"connected": False, "enabled": self.enabled}
 
+        now = time.monotonic()
+        if self._stats is not None and now - self._stats_at < max_age:
+            return self._stats
+
         try:
-            info = await self._redis.info("memory")
-            db_size = await self._redis.dbsize()
+            # Both reads in one round-trip
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.info("memory")
+                pipe.dbsize()
+                info, db_size = await pipe.execute()
 
-            return {
+            self._stats = {
                 "connected": True,
                 "enabled": self.enabled,
                 "total_keys": db_size,
                 "memory_used": info.get("used_memory_human", "N/A"),
                 "ttl_seconds": self.ttl,
             }
+            self._stats_at = now
+            return self._stats
         except Exception as e:
-            logger.error(f"Cache stats error: {e}")
+            logger.error("Cache stats error: %s", e)
             return {"connected": False, "error": str(e)}
 
 
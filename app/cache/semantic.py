@@ -0,0 +1,200 @@
+"""
+Semantic Answer Cache
+
+Disk-backed cache that serves answers for near-duplicate questions
+("What is X?" vs "Tell me about X") without calling the LLM.
+Single Responsibility: Only handles similarity-keyed answer caching.
+"""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Optional, Set, Tuple
+
+import diskcache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global semantic cache instance
+_semantic_cache: Optional["SemanticCache"] = None
+_semantic_cache_lock = threading.Lock()
+
+# Words, plus operators so "2+2" and "2*2" differ (":" and "|" never appear,
+# they delimit cache keys)
+_TOKEN_RE = re.compile(r"\w+|[+*/^%=<>&~]|(?<=\d)-(?=\s*\d)")
+
+# Question scaffolding that carries no topic signal. "what" is the default
+# question type; how/who/why/which/when/where change the meaning and stay.
+STOPWORDS = frozenset("""
+    a about an and are as at be can could do does explain for from give i
+    in is it me of on or please should tell the to what whats
+    with would you your
+    """.split())
+
+
+@lru_cache(maxsize=1024)
+def _content_terms(question: str) -> Tuple[str, ...]:
+    """Content words of a question (memoized: repeats skip tokenization)."""
+    return tuple(t for t in _TOKEN_RE.findall(question.lower()) if t not in STOPWORDS)
+
+
+def question_vector(question: str) -> Counter:
+    """
+    Term-frequency vector of the question's content words and their bigrams.
+
+    Bigrams ("python>java") keep word order, so reversed questions such as
+    "celsius to fahrenheit" vs "fahrenheit to celsius" don't collide.
+    """
+    terms = _content_terms(question)
+    return Counter(chain(terms, map(">".join, zip(terms, terms[1:]))))
+
+
+def _norm(vector: Counter) -> float:
+    return math.sqrt(sum(v * v for v in vector.values()))
+
+
+class SemanticCache:
+    """
+    Similarity-keyed answer cache.
+
+    Features:
+    - Cosine similarity over content-word and bigram vectors (no embedding model)
+    - Entries are scoped to the model that produced them
+    - Inverted index so lookups only score questions sharing a term
+    - diskcache persistence with TTL, so entries survive restarts
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        threshold: Optional[float] = None,
+        ttl: Optional[int] = None,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            directory: diskcache directory (defaults to settings)
+            threshold: Minimum cosine similarity for a hit (defaults to settings)
+            ttl: Entry lifetime in seconds (defaults to settings)
+        """
+        self.threshold = threshold or settings.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = ttl or settings.SEMANTIC_CACHE_TTL
+        self._disk = diskcache.Cache(directory or settings.SEMANTIC_CACHE_DIR)
+        self._lock = threading.Lock()
+        self._vectors: Dict[str, Tuple[Counter, float]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+        for key in self._disk.iterkeys():
+            self._index(key)
+        logger.info("🧠 Semantic cache loaded | %s entries", len(self._vectors))
+
+    @staticmethod
+    def _key(vector: Counter, model: str) -> str:
+        """Canonical key: model, then sorted content terms with counts."""
+        return f"{model}|" + " ".join(f"{t}:{c}" for t, c in sorted(vector.items()))
+
+    def _index(self, key: str) -> None:
+        terms = key.rpartition("|")[2]
+        vector = Counter(
+            {t: int(c) for t, c in (item.split(":") for item in terms.split())}
+        )
+        self._vectors[key] = (vector, _norm(vector))
+        for term in vector:
+            self._postings.setdefault(term, set()).add(key)
+
+    def _unindex(self, key: str) -> None:
+        vector, _ = self._vectors.pop(key, (Counter(), 0.0))
+        for term in vector:
+            keys = self._postings.get(term)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[term]
+
+    def _nearest(self, vector: Counter, model: str) -> Tuple[Optional[str], float]:
+        """Most similar cached key for the model and its cosine similarity."""
+        norm = _norm(vector)
+        if not norm:
+            return None, 0.0
+
+        prefix = f"{model}|"
+        with self._lock:
+            candidates = set().union(*(self._postings.get(t, ()) for t in vector))
+            best_key, best_sim = None, 0.0
+            for key in candidates:
+                if not key.startswith(prefix):
+                    continue
+                other, other_norm = self._vectors[key]
+                dot = sum(c * other.get(t, 0) for t, c in vector.items())
+                sim = dot / (norm * other_norm)
+                if sim > best_sim:
+                    best_key, best_sim = key, sim
+        return best_key, best_sim
+
+    def get(self, question: str, model: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Get the cached answer of the most similar prior question.
+
+        Args:
+            question: User question
+            model: Model that must have produced the cached answer
+
+        Returns:
+            Cached result dict, or None below the similarity threshold
+        """
+        key, sim = self._nearest(question_vector(question), model)
+        if key is None or sim < self.threshold:
+            return None
+
+        result = self._disk.get(key)
+        if result is None:  # Expired on disk
+            with self._lock:
+                self._unindex(key)
+            return None
+
+        logger.info("🧠 Semantic cache HIT (similarity %.2f)", sim)
+        return result
+
+    def set(self, question: str, result: Dict[str, Any], model: str = "") -> None:
+        """Cache a result under the model and the question's term vector."""
+        vector = question_vector(question)
+        if not vector:
+            return
+
+        key = self._key(vector, model)
+        try:
+            self._disk.set(key, result, expire=self.ttl)
+        except Exception as e:
+            logger.error("Semantic cache set error: %s", e)
+            return
+
+        with self._lock:
+            if key not in self._vectors:
+                self._index(key)
+
+    def close(self) -> None:
+        """Close the underlying disk cache."""
+        self._disk.close()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Get or create the global semantic cache (None when disabled)."""
+    global _semantic_cache
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                try:
+                    _semantic_cache = SemanticCache()
+                except Exception as e:
+                    logger.warning("Semantic cache unavailable: %s", e)
+                    return None
+    return _semantic_cache
@@ -4,19 +4,25 @@ Configuration Management
 This module manages all application configuration from environment variables.
 """
 
+from pathlib import Path
 from typing import List, Optional, Union
 
 from pydantic import field_validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
 
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+
     # API Configuration
     API_TITLE: str = "SearchFlow"
     API_VERSION: str = "0.1.0"
     DEBUG: bool = False
+    # Server processes for `python -m app.main`; batch jobs and in-process
+    # caches are per worker, so keep 1 unless routing is sticky
+    WORKERS: int = 1
 
     # CORS Configuration
     ALLOWED_ORIGINS: Union[
@@ -34,6 +40,21 @@ class Settings(BaseSettings):
     CACHE_ENABLED: bool = True
     CACHE_TTL: int = 3600  # 1 hour in seconds
     CACHE_PREFIX: str = "searchflow:"
+    SUGGESTIONS_CACHE_TTL: int = 3600  # 1 hour in seconds
+    TRENDING_CACHE_TTL: int = 300  # Trending topics reuse window (seconds)
+    LOCAL_CACHE_SIZE: int = 1024  # In-process entries checked before Redis
+    LOCAL_CACHE_TTL: int = 60  # Seconds; bounds staleness across workers
+    REDIS_MAX_CONNECTIONS: int = 64  # Pool size shared by all requests
+    REDIS_POOL_TIMEOUT: int = 5  # Seconds to wait for a free connection
+    HEALTH_STATS_TTL: float = 1.0  # Seconds health probes reuse cache stats
+
+    # Semantic Cache Configuration (near-duplicate questions)
+    SEMANTIC_CACHE_ENABLED: bool = False  # Opt-in: similar questions share answers
+    SEMANTIC_CACHE_DIR: str = str(
+        Path(__file__).resolve().parents[2] / "data" / "cache" / "semcache"
+    )  # Project-local; only created when SEMANTIC_CACHE_ENABLED
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Min cosine similarity for a hit
+    SEMANTIC_CACHE_TTL: int = 86400  # 24 hours in seconds
 
     # LLM Configuration (for DSPy)
     LLM_PROVIDER: str = (
@@ -68,6 +89,35 @@ class Settings(BaseSettings):
     OPENROUTER_MAX_TOKENS: int = 5000
     OPENROUTER_TEMPERATURE: float = 0.3
 
+    # Model Routing ("single": one LLM; "cascade": simple queries use fast LLM)
+    LLM_ROUTING_MODE: str = "single"
+    FAST_LLM_PROVIDER: str = "groq"
+    FAST_LLM_MODEL: Optional[str] = None  # Defaults to the provider's model
+
+    # Pipeline Configuration
+    DSPY_ASYNC_MAX_WORKERS: int = 32  # Worker threads for async DSPy calls
+    THREAD_POOL_WORKERS: int = 32  # Default executor size (asyncio.to_thread)
+    SEARCH_MAX_INFLIGHT: int = 8  # Concurrent pipeline runs; others queue
+    RETRIEVAL_CONCURRENCY: int = 8  # Parallel SearXNG calls per batch
+    RETRIEVAL_CACHE_SIZE: int = 1024  # Max cached SearXNG results per retriever
+    RETRIEVAL_CACHE_TTL: int = 300  # 5 minutes in seconds
+    LLM_CACHE_SIZE: int = 1024  # Max cached LLM responses per signature
+    LLM_CACHE_TTL: int = 86400  # 24 hours in seconds
+    FUSE_LLM_STAGES: bool = True  # Rerank + answer in a single LLM call
+    FUSED_MIN_MAX_TOKENS: int = 1000  # Fall back to staged calls below this
+    SEARCH_K_RESULTS: int = 10  # SearXNG results retrieved per query
+    RERANK_PREFILTER_K: int = 5  # BM25 keeps this many for LLM rerank (0 = off)
+    CONTEXT_TOKENS: int = 1500  # Answer context budget (simple queries)
+    COMPLEX_CONTEXT_TOKENS: int = 1800  # Answer context budget (complex queries)
+    ENABLE_PROMPT_COMPRESSION: bool = False  # Extractive passage compression
+    PROMPT_COMPRESSION_MIN_TOKENS: int = 1500  # Only compress contexts above this
+    PROMPT_COMPRESSION_RATIO: float = 0.5  # Fraction of sentences kept
+
+    # Batch Export Configuration
+    BATCH_MAX_QUERIES: int = 50  # Max queries per batch export job
+    BATCH_JOB_TTL: int = 3600  # Finished jobs kept for 1 hour
+    MCP_JOB_WAIT: float = 5.0  # Seconds research_topic runs before going async
+
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
 
@@ -79,10 +129,6 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",")]
         return v
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-
 
 # Create settings instance
 settings = Settings()
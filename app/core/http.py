@@ -0,0 +1,35 @@
+"""
+Shared HTTP Client
+
+One pooled httpx.AsyncClient for outbound calls to SearXNG.
+Single Responsibility: Only manages the process-wide connection pool.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled async client, recreated if the event loop changed."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if one was opened."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,39 @@
+"""
+Background Tasks
+
+Strong references to fire-and-forget jobs (batch exports, MCP research).
+Single Responsibility: Only tracks and shuts down background tasks.
+"""
+
+import asyncio
+import logging
+from typing import Any, Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+# The event loop only keeps weak references to tasks; job tables are TTL
+# caches, so running jobs are held here until they finish
+_tasks: Set[asyncio.Task] = set()
+
+
+def _on_done(task: asyncio.Task) -> None:
+    """Forget a finished task and log its failure (marks it retrieved)."""
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed: %s", task.get_name(), task.exception())
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any], name: str) -> asyncio.Task:
+    """Start a tracked task that survives eviction from any job table."""
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+async def cancel_background_tasks() -> None:
+    """Cancel running background tasks and wait for them to unwind."""
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,19 +4,77 @@ FastAPI Application Entry Point
 Main entry point for SearchFlow API.
 """
 
-from fastapi import FastAPI
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.exports import router as export_router
+from app.api.responses import ORJSONResponse
 from app.api.routes import router as search_router
 from app.cache.redis_client import close_cache_client, get_cache_client
 from app.core.config import settings
+from app.core.http import close_http_client
 from app.core.logging import setup_logging
+from app.core.tasks import cancel_background_tasks
+from app.services import get_search_service
+from app.services.suggestions import (
+    close_suggestion_service,
+    get_suggestion_service,
+)
 
 # Setup logging
 logger = setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize shared resources on startup and release them on shutdown."""
+    logger.info("SearchFlow API starting up")
+    # Size the default executor for blocking work offloaded via to_thread
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.THREAD_POOL_WORKERS)
+    )
+    logger.info("Environment: Debug=%s", settings.DEBUG)
+    logger.info("SearXNG URL: %s", settings.SEARXNG_URL)
+
+    cache = await get_cache_client()
+    if cache._connected:
+        logger.info("Cache initialized successfully")
+    else:
+        logger.warning("Cache not available - running without caching")
+
+    # Construct the shared pipeline and suggestion service now so the
+    # first request doesn't pay for them
+    service = await get_search_service()
+    if service.warm_up():
+        logger.info("Search pipeline initialized")
+    trending_warm_up = None
+    try:
+        suggestions = get_suggestion_service()
+    except ValueError as e:
+        logger.warning("Suggestion service not initialized: %s", e)
+    else:
+        # Prime the trending-topics cache without delaying startup
+        trending_warm_up = asyncio.create_task(suggestions.warm_up())
+
+    yield
+
+    logger.info("SearchFlow API shutting down")
+    if trending_warm_up is not None:
+        trending_warm_up.cancel()
+    await cancel_background_tasks()
+    await service.aclose()
+    await close_suggestion_service()
+    await close_http_client()
+    await close_cache_client()
+    logger.info("Connections closed")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="SearchFlow API",
@@ -24,6 +82,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -35,31 +95,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON/Markdown responses; text/event-stream is excluded by default,
+# and EventSourceResponse already sends X-Accel-Buffering: no
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Handle uncaught exceptions."""
-    logger.error(f"Uncaught exception: {exc}", exc_info=True)
-    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+    logger.error("Uncaught exception: %s", exc, exc_info=True)
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
+# Probe responses are encoded here, bypassing jsonable_encoder
+_ROOT_BODY = orjson.dumps(
+    {"message": "SearchFlow is running", "version": "0.1.0", "docs": "/docs"}
+)
+_HEALTH_FIELDS = {"status": "healthy", "version": "0.1.0", "service": "SearchFlow API"}
 
 
 @app.get("/", tags=["health"])
 async def root():
     """Root endpoint - service status."""
-    return {"message": "SearchFlow is running", "version": "0.1.0", "docs": "/docs"}
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", tags=["health"])
 async def health():
     """Health check endpoint."""
     cache = await get_cache_client()
-    cache_stats = await cache.get_stats()
-    return {
-        "status": "healthy",
-        "version": "0.1.0",
-        "service": "SearchFlow API",
-        "cache": cache_stats,
-    }
+    cache_stats = await cache.get_stats(max_age=settings.HEALTH_STATS_TTL)
+    return Response(
+        orjson.dumps({**_HEALTH_FIELDS, "cache": cache_stats}),
+        media_type="application/json",
+    )
 
 
 # Include routers
@@ -67,29 +136,19 @@ app.include_router(search_router)
 app.include_router(export_router)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Execute on application startup."""
-    logger.info("SearchFlow API starting up")
-    logger.info(f"Environment: Debug={settings.DEBUG}")
-    logger.info(f"SearXNG URL: {settings.SEARXNG_URL}")
-
-    cache = await get_cache_client()
-    if cache._connected:
-        logger.info("Cache initialized successfully")
-    else:
-        logger.warning("Cache not available - running without caching")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Execute on application shutdown."""
-    logger.info("SearchFlow API shutting down")
-    await close_cache_client()
-    logger.info("Cache connection closed")
-
-
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8007, log_level=settings.LOG_LEVEL.lower())
+    # Import string so uvicorn can spawn WORKERS processes (each connects
+    # its own Redis pool and warms its own pipeline in lifespan)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8007,
+        workers=settings.WORKERS,
+        # "auto" picks uvloop/httptools when installed (uvicorn[standard],
+        # not on Windows) and falls back to asyncio/h11 otherwise
+        loop="auto",
+        http="auto",
+        log_level=settings.LOG_LEVEL.lower(),
+    )
@@ -7,17 +7,109 @@ Compatible with Claude Desktop, GPT-based agents, and other MCP clients.
 
 import asyncio
 import logging
-from typing import Any
+import uuid
+from typing import Any, Awaitable, Callable
 
+from cachetools import TTLCache
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
-from app.cache.redis_client import CacheClient, get_cache_client
+from app.core.config import settings
+from app.core.tasks import cancel_background_tasks, run_in_background
 from app.mcp.search_tool import SearchTools
+from app.services import get_search_service
 
 logger = logging.getLogger(__name__)
 
+# Research jobs that outlived MCP_JOB_WAIT, by id (expire after BATCH_JOB_TTL);
+# running tasks are also held by app.core.tasks, so eviction can't drop them
+_jobs: TTLCache = TTLCache(maxsize=256, ttl=settings.BATCH_JOB_TTL)
+
+# Static tool list, built once: MCP clients poll list_tools
+_TOOLS: list[Tool] = [
+    Tool(
+        name="web_search",
+        description="Search the web and get an AI-synthesized answer. "
+        "Use this for quick questions that need up-to-date information.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The search query or question to answer",
+                },
+                "skip_cache": {
+                    "type": "boolean",
+                    "description": "If true, bypass cache and force fresh search",
+                    "default": False,
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+    Tool(
+        name="research_topic",
+        description="Deep research on a topic with multiple related queries. "
+        "Use this for comprehensive understanding of a subject. "
+        "Long research returns a job id; fetch the result with poll_job.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "topic": {
+                    "type": "string",
+                    "description": "The topic to research in depth",
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "Number of related queries (1-5)",
+                    "default": 3,
+                    "minimum": 1,
+                    "maximum": 5,
+                },
+            },
+            "required": ["topic"],
+        },
+    ),
+    Tool(
+        name="poll_job",
+        description="Get the result of a research_topic job, "
+        "or its status if it is still running.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job id returned by research_topic",
+                },
+            },
+            "required": ["job_id"],
+        },
+    ),
+    Tool(
+        name="get_sources",
+        description="Get raw search sources without AI synthesis. "
+        "Use this to see actual search results.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The search query",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum sources to return",
+                    "default": 10,
+                    "minimum": 1,
+                    "maximum": 20,
+                },
+            },
+            "required": ["query"],
+        },
+    ),
+]
+
 
 def create_mcp_server() -> Server:
     """
@@ -28,183 +120,130 @@ def create_mcp_server() -> Server:
     """
     server = Server("searchflow")
     search_tools: SearchTools | None = None
-    cache: CacheClient | None = None
 
     @server.list_tools()
     async def list_tools() -> list[Tool]:
         """List available search tools."""
-        return [
-            Tool(
-                name="web_search",
-                description="Search the web and get an AI-synthesized answer. "
-                "Use this for quick questions that need up-to-date information.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "The search query or question to answer",
-                        },
-                        "skip_cache": {
-                            "type": "boolean",
-                            "description": "If true, bypass cache and force fresh search",
-                            "default": False,
-                        },
-                    },
-                    "required": ["query"],
-                },
-            ),
-            Tool(
-                name="research_topic",
-                description="Deep research on a topic with multiple related queries. "
-                "Use this for comprehensive understanding of a subject.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "topic": {
-                            "type": "string",
-                            "description": "The topic to research in depth",
-                        },
-                        "depth": {
-                            "type": "integer",
-                            "description": "Number of related queries (1-5)",
-                            "default": 3,
-                            "minimum": 1,
-                            "maximum": 5,
-                        },
-                    },
-                    "required": ["topic"],
-                },
-            ),
-            Tool(
-                name="get_sources",
-                description="Get raw search sources without AI synthesis. "
-                "Use this to see actual search results.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "The search query",
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum sources to return",
-                            "default": 10,
-                            "minimum": 1,
-                            "maximum": 20,
-                        },
-                    },
-                    "required": ["query"],
-                },
-            ),
-        ]
+        return _TOOLS
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
         """Execute a search tool."""
-        nonlocal search_tools, cache
+        nonlocal search_tools
+
+        handler = _HANDLERS.get(name)
+        if handler is None:
+            return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
         # Initialize tools on first use
         if search_tools is None:
-            cache = await get_cache_client()
-            search_tools = SearchTools(cache=cache)
+            search_tools = SearchTools(service=await get_search_service())
 
         try:
-            if name == "web_search":
-                result = await search_tools.web_search(
-                    query=arguments["query"],
-                    skip_cache=arguments.get("skip_cache", False),
-                )
-                return [
-                    TextContent(
-                        type="text",
-                        text=_format_search_result(result),
-                    )
-                ]
-
-            elif name == "research_topic":
-                result = await search_tools.research_topic(
-                    topic=arguments["topic"],
-                    depth=arguments.get("depth", 3),
-                )
-                return [
-                    TextContent(
-                        type="text",
-                        text=_format_research_result(result),
-                    )
-                ]
-
-            elif name == "get_sources":
-                result = await search_tools.get_sources(
-                    query=arguments["query"],
-                    limit=arguments.get("limit", 10),
-                )
-                return [
-                    TextContent(
-                        type="text",
-                        text=_format_sources_result(result),
-                    )
-                ]
-
-            else:
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Unknown tool: {name}",
-                    )
-                ]
-
+            text = await handler(search_tools, arguments)
         except Exception as e:
-            logger.error(f"Tool execution failed: {e}")
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Error executing {name}: {str(e)}",
-                )
-            ]
+            logger.error("Tool execution failed: %s", e)
+            text = f"Error executing {name}: {str(e)}"
+        return [TextContent(type="text", text=text)]
 
     return server
 
 
+async def _web_search(tools: SearchTools, arguments: dict[str, Any]) -> str:
+    result = await tools.web_search(
+        query=arguments["query"],
+        skip_cache=arguments.get("skip_cache", False),
+    )
+    return _format_search_result(result)
+
+
+async def _research_topic(tools: SearchTools, arguments: dict[str, Any]) -> str:
+    # Answer inline when quick; otherwise hand back a job id so the client
+    # doesn't time out and retry the whole fan-out
+    task = run_in_background(
+        tools.research_topic(
+            topic=arguments["topic"],
+            depth=arguments.get("depth", 3),
+        ),
+        name="mcp-research",
+    )
+    done, _ = await asyncio.wait({task}, timeout=settings.MCP_JOB_WAIT)
+    if task in done:
+        return _format_research_result(task.result())
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = task
+    return _format_job_pending(job_id)
+
+
+async def _poll_job(tools: SearchTools, arguments: dict[str, Any]) -> str:
+    job_id = arguments["job_id"]
+    task = _jobs.get(job_id)
+    if task is None:
+        return f"Error: Unknown or expired job: {job_id}"
+    if not task.done():
+        return _format_job_pending(job_id)
+    del _jobs[job_id]
+    return _format_research_result(task.result())
+
+
+async def _get_sources(tools: SearchTools, arguments: dict[str, Any]) -> str:
+    result = await tools.get_sources(
+        query=arguments["query"],
+        limit=arguments.get("limit", 10),
+    )
+    return _format_sources_result(result)
+
+
+# Tool name -> handler returning the rendered text (one lookup per call)
+_HANDLERS: dict[str, Callable[[SearchTools, dict[str, Any]], Awaitable[str]]] = {
+    "web_search": _web_search,
+    "research_topic": _research_topic,
+    "poll_job": _poll_job,
+    "get_sources": _get_sources,
+}
+
+
 def _format_search_result(result: dict) -> str:
     """Format search result for display."""
     if result.get("error"):
         return f"Error: {result['error']}"
 
-    output = []
-    output.append(f"**Answer:**\n{result.get('answer', 'No answer available')}\n")
-    output.append(f"**Confidence:** {result.get('confidence', 0):.0%}")
-
-    if result.get("cached"):
-        output.append("*(from cache)*")
-
+    # Parts are joined once, so the reply is allocated a single time
     sources = result.get("sources", [])
-    if sources:
-        output.append(f"\n**Sources ({len(sources)}):**")
-        for i, url in enumerate(sources[:5], 1):
-            output.append(f"  {i}. {url}")
-
-    return "\n".join(output)
+    return "".join(
+        [
+            f"**Answer:**\n{result.get('answer', 'No answer available')}\n\n"
+            f"**Confidence:** {result.get('confidence', 0):.0%}",
+            "\n*(from cache)*" if result.get("cached") else "",
+            f"\n\n**Sources ({len(sources)}):**" if sources else "",
+            *[f"\n  {i}. {url}" for i, url in enumerate(sources[:5], 1)],
+        ]
+    )
 
 
 def _format_research_result(result: dict) -> str:
     """Format research result for display."""
-    output = []
-    output.append(f"# Research: {result.get('topic', 'Unknown')}\n")
-    output.append(f"*Explored {result.get('queries_explored', 0)} queries*\n")
-
-    for item in result.get("research", []):
-        output.append(f"## {item.get('query', '')}")
-        output.append(f"{item.get('answer', '')}\n")
-
     sources = result.get("sources", [])
-    if sources:
-        output.append(f"## Sources ({len(sources)})")
-        for url in sources:
-            output.append(f"- {url}")
+    return "".join(
+        [
+            f"# Research: {result.get('topic', 'Unknown')}\n\n"
+            f"*Explored {result.get('queries_explored', 0)} queries*\n",
+            *[
+                f"\n## {item.get('query', '')}\n{item.get('answer', '')}\n"
+                for item in result.get("research", [])
+            ],
+            f"\n## Sources ({len(sources)})" if sources else "",
+            *[f"\n- {url}" for url in sources],
+        ]
+    )
+
 
-    return "\n".join(output)
+def _format_job_pending(job_id: str) -> str:
+    """Format a still-running job's status for display."""
+    return (
+        f"**Research in progress.** Job id: `{job_id}`\n"
+        "Call poll_job with this id to get the result."
+    )
 
 
 def _format_sources_result(result: dict) -> str:
@@ -212,32 +251,45 @@ def _format_sources_result(result: dict) -> str:
     if result.get("error"):
         return f"Error: {result['error']}"
 
-    output = []
-    output.append(f"**Query:** {result.get('query', '')}")
-    output.append(f"**Found:** {result.get('total_found', 0)} sources\n")
-
-    for i, source in enumerate(result.get("sources", []), 1):
-        output.append(f"### {i}. {source.get('title', 'Untitled')}")
-        output.append(f"**URL:** {source.get('url', '')}")
-        output.append(f"**Engine:** {source.get('engine', 'unknown')}")
-        output.append(f"{source.get('snippet', '')}\n")
-
-    return "\n".join(output)
+    return "".join(
+        [
+            f"**Query:** {result.get('query', '')}\n"
+            f"**Found:** {result.get('total_found', 0)} sources\n",
+            *[
+                f"\n### {i}. {source.get('title', 'Untitled')}\n"
+                f"**URL:** {source.get('url', '')}\n"
+                f"**Engine:** {source.get('engine', 'unknown')}\n"
+                f"{source.get('snippet', '')}\n"
+                for i, source in enumerate(result.get("sources", []), 1)
+            ],
+        ]
+    )
 
 
 async def run_mcp_server():
     """Run the MCP server via stdio."""
     server = create_mcp_server()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream, write_stream, server.create_initialization_options()
-        )
+    # Build the shared pipeline before the first tool call needs it
+    (await get_search_service()).warm_up()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream, write_stream, server.create_initialization_options()
+            )
+    finally:
+        await cancel_background_tasks()
 
 
 def main():
     """Entry point for MCP server."""
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(run_mcp_server())
+    try:
+        # Same loop the API runs on (uvicorn[standard] ships it off Windows)
+        import uvloop
+    except ImportError:
+        asyncio.run(run_mcp_server())
+    else:
+        uvloop.run(run_mcp_server())
 
 
 if __name__ == "__main__":
@@ -29,15 +29,21 @@ class SearchTools:
     - get_sources: Get raw sources without AI synthesis
     """
 
-    def __init__(self, cache: Optional[CacheClient] = None):
+    def __init__(
+        self,
+        cache: Optional[CacheClient] = None,
+        service: Optional[SearchService] = None,
+    ):
         """
         Initialize search tools.
 
         Args:
             cache: Optional cache client for faster responses
+            service: Existing SearchService to delegate to (e.g. the
+                process-wide one); a new one is built around cache if omitted
         """
         # Use composition - delegate to SearchService
-        self._service = SearchService(cache=cache)
+        self._service = service or SearchService(cache=cache)
 
     async def web_search(
         self,
@@ -54,7 +60,7 @@ class SearchTools:
         Returns:
             Dict with answer, sources, and confidence score
         """
-        logger.info(f"MCP web_search: {query}")
+        logger.info("MCP web_search: %s", query)
 
         try:
             result = await self._service.search(
@@ -71,7 +77,7 @@ class SearchTools:
             }
 
         except Exception as e:
-            logger.error(f"MCP web_search failed: {e}")
+            logger.error("MCP web_search failed: %s", e)
             return {
                 "error": str(e),
                 "answer": "",
@@ -94,12 +100,12 @@ class SearchTools:
         Returns:
             Dict with comprehensive research summary
         """
-        logger.info(f"MCP research_topic: {topic} (depth={depth})")
+        logger.info("MCP research_topic: %s (depth=%s)", topic, depth)
 
         try:
             return await self._service.research_topic(topic, depth)
         except Exception as e:
-            logger.error(f"MCP research_topic failed: {e}")
+            logger.error("MCP research_topic failed: %s", e)
             return {
                 "error": str(e),
                 "topic": topic,
@@ -125,12 +131,12 @@ class SearchTools:
         Returns:
             Dict with list of sources
         """
-        logger.info(f"MCP get_sources: {query}")
+        logger.info("MCP get_sources: %s", query)
 
         try:
             return await self._service.get_sources(query, limit)
         except Exception as e:
-            logger.error(f"MCP get_sources failed: {e}")
+            logger.error("MCP get_sources failed: %s", e)
             return {
                 "error": str(e),
                 "query": query,
@@ -5,8 +5,10 @@ Generates structured JSON output from search results.
 Single Responsibility: Only handles JSON formatting.
 """
 
-from datetime import datetime
-from typing import Any, Dict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+import orjson
 
 
 class JsonFormatter:
@@ -27,41 +29,75 @@ class JsonFormatter:
         Returns:
             Structured JSON dict
         """
-        output = {
-            "query": result.get("question", ""),
-            "answer": result.get("answer", ""),
-            "confidence": result.get("confidence", 0),
-            "sources": [],
-            "context": [],
-        }
+        timestamp = (
+            datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            if include_metadata
+            else None
+        )
+        return JsonFormatter._build(result, timestamp)
+
+    @staticmethod
+    def format_bytes(
+        result: Dict[str, Any],
+        include_metadata: bool = True,
+    ) -> bytes:
+        """
+        Format search result as serialized JSON, ready to send.
 
-        # Format sources
-        for url in result.get("sources", []):
-            if isinstance(url, str):
-                output["sources"].append({"url": url})
-            elif isinstance(url, dict):
-                output["sources"].append(url)
+        Same document as format(); orjson encodes the aware UTC timestamp
+        natively, so no ISO string is built in Python.
 
-        # Format context
-        for ctx in result.get("context", []):
-            if isinstance(ctx, dict):
-                output["context"].append(
-                    {
-                        "text": ctx.get("text", "")[:500],
-                        "url": ctx.get("url", ""),
-                        "title": ctx.get("title", ""),
-                        "source": ctx.get("source", ""),
-                    }
-                )
+        Args:
+            result: Search result from pipeline
+            include_metadata: Include timestamp and version info
 
-        if include_metadata:
-            output["metadata"] = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "version": "1.0",
-                "cached": result.get("cached", False),
-            }
+        Returns:
+            UTF-8 JSON bytes
+        """
+        timestamp = datetime.now(timezone.utc) if include_metadata else None
+        return orjson.dumps(
+            JsonFormatter._build(result, timestamp),
+            option=orjson.OPT_UTC_Z,
+        )
 
-        return output
+    @staticmethod
+    def _build(
+        result: Dict[str, Any],
+        timestamp: Optional[Union[str, datetime]],
+    ) -> Dict[str, Any]:
+        """Build the output document (metadata only when timestamp is set)."""
+        return {
+            "query": result.get("question", ""),
+            "answer": result.get("answer", ""),
+            "confidence": result.get("confidence", 0),
+            "sources": [
+                {"url": url} if isinstance(url, str) else url
+                for url in result.get("sources", [])
+                if isinstance(url, (str, dict))
+            ],
+            "context": [
+                {
+                    "text": ctx.get("text", "")[:500],
+                    "url": ctx.get("url", ""),
+                    "title": ctx.get("title", ""),
+                    "source": ctx.get("source", ""),
+                }
+                for ctx in result.get("context") or []
+                if isinstance(ctx, dict)
+            ],
+            # Declared in the literal so the dict is sized once, not grown
+            **(
+                {
+                    "metadata": {
+                        "timestamp": timestamp,
+                        "version": "1.0",
+                        "cached": result.get("cached", False),
+                    }
+                }
+                if timestamp is not None
+                else {}
+            ),
+        }
 
 
 def format_as_json(result: Dict[str, Any]) -> Dict[str, Any]:
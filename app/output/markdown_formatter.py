@@ -5,7 +5,7 @@ Generates Markdown documents from search results.
 Single Responsibility: Only handles Markdown formatting.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 
@@ -39,7 +39,7 @@ class MarkdownFormatter:
         # Metadata
         confidence = result.get("confidence", 0)
         cached = result.get("cached", False)
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
         lines.append(f"> **Confidence:** {confidence:.0%} | **Generated:** {timestamp}")
         if cached:
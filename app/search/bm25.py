@@ -0,0 +1,59 @@
+"""
+BM25 Scoring
+
+Lexical relevance scoring (Okapi BM25) over a small set of passages.
+Single Responsibility: Only scores passages against a query.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bm25_scores(
+    query: str, documents: List[str], k1: float = 1.5, b: float = 0.75
+) -> List[float]:
+    """
+    Score each document against the query with Okapi BM25.
+
+    Args:
+        query: Search query
+        documents: Passages to score
+        k1: Term-frequency saturation
+        b: Document-length normalization
+
+    Returns:
+        One non-negative score per document, in input order
+    """
+    docs = [tokenize(d) for d in documents]
+    n = len(docs)
+    if n == 0:
+        return []
+
+    avgdl = sum(len(d) for d in docs) / n or 1.0
+    df = Counter()
+    for d in docs:
+        df.update(set(d))
+
+    terms = set(tokenize(query))
+    idf = {t: math.log((n - df[t] + 0.5) / (df[t] + 0.5) + 1) for t in terms}
+
+    scores = []
+    for d in docs:
+        tf = Counter(d)
+        norm = k1 * (1 - b + b * len(d) / avgdl)
+        score = 0.0
+        for t in terms:
+            f = tf.get(t)
+            if f:
+                score += idf[t] * f * (k1 + 1) / (f + norm)
+        scores.append(score)
+    return scores
@@ -14,7 +14,11 @@ Score Tiers:
 """
 
 import logging
-from typing import Dict
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
@@ -97,18 +101,72 @@ LOW_QUALITY_PATTERNS = [
     "online-tool",
 ]
 
+# All patterns in one alternation: a single scan of the domain
+_LOW_QUALITY_RE = re.compile("|".join(map(re.escape, LOW_QUALITY_PATTERNS)))
 
+
+@lru_cache(maxsize=8192)
 def get_domain(url: str) -> str:
-    """Extract domain from URL."""
+    """Extract domain from URL (memoized: repeat URLs skip parsing)."""
     try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        # Remove www. prefix
-        if domain.startswith("www."):
-            domain = domain[4:]
-        return domain
-    except Exception:
+        domain = urlparse(url).netloc.lower()
+    except ValueError:  # e.g. an unclosed IPv6 bracket
         return ""
+    # Remove www. prefix
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return sys.intern(domain)
+
+
+# Trie node keys; labels are always str, so int keys never collide
+_EXACT = 0  # the walked labels are exactly a known domain
+_ANY = 1  # at least one more label follows (trusted TLD fallback)
+
+
+def _freeze(node: dict) -> Mapping:
+    return MappingProxyType(
+        {k: _freeze(v) if isinstance(v, dict) else v for k, v in node.items()}
+    )
+
+
+def _build_domain_trie(
+    domain_scores: Dict[str, tuple[float, str]], trusted_tlds: Dict[str, float]
+) -> Mapping:
+    """
+    Build a read-only suffix trie over both reputation tables.
+
+    Nodes are keyed on reversed DNS labels, so one walk over a domain's
+    labels finds its longest known suffix in a few dict probes,
+    regardless of table size.
+    """
+    root: dict = {}
+
+    def node_for(suffix: str) -> dict:
+        node = root
+        for label in reversed(suffix.split(".")):
+            node = node.setdefault(label, {})
+        return node
+
+    for tld, score in trusted_tlds.items():
+        node_for(tld.lstrip("."))[_ANY] = (score, f"trusted_tld_{tld}")
+    for domain, value in domain_scores.items():
+        node_for(domain)[_EXACT] = value
+    return _freeze(root)
+
+
+_TRIE = _build_domain_trie(DOMAIN_SCORES, TRUSTED_TLDS)
+
+
+def _trie_lookup(domain: str) -> Optional[tuple[float, str]]:
+    """Value of the longest matching suffix, or None."""
+    node, match = _TRIE, None
+    for label in reversed(domain.split(".")):
+        match = node.get(_ANY, match)
+        node = node.get(label)
+        if node is None:
+            break
+        match = node.get(_EXACT, match)
+    return match
 
 
 def get_credibility_score(url: str) -> tuple[float, str]:
@@ -127,24 +185,20 @@ def get_credibility_score(url: str) -> tuple[float, str]:
     if not domain:
         return (0.5, "unknown")
 
-    # Check exact domain match
-    if domain in DOMAIN_SCORES:
-        return DOMAIN_SCORES[domain]
+    return _score_for_domain(domain)
 
-    # Check if domain ends with a known domain (subdomain support)
-    for known_domain, (score, category) in DOMAIN_SCORES.items():
-        if domain.endswith(f".{known_domain}") or domain == known_domain:
-            return (score, category)
 
-    # Check trusted TLDs
-    for tld, score in TRUSTED_TLDS.items():
-        if domain.endswith(tld):
-            return (score, f"trusted_tld_{tld}")
+@lru_cache(maxsize=4096)
+def _score_for_domain(domain: str) -> tuple[float, str]:
+    """Score a bare domain (memoized: sources repeat domains heavily)."""
+    # Known domain or subdomain, else trusted TLD (longest suffix wins)
+    match = _trie_lookup(domain)
+    if match is not None:
+        return match
 
     # Check low quality patterns
-    for pattern in LOW_QUALITY_PATTERNS:
-        if pattern in domain:
-            return (0.30, "low_quality")
+    if _LOW_QUALITY_RE.search(domain):
+        return (0.30, "low_quality")
 
     # Default score for unknown domains
     return (0.55, "general")
@@ -160,20 +214,14 @@ def enrich_with_credibility(sources: list[dict]) -> list[dict]:
     Returns:
         Same list with added 'credibility_score' and 'credibility_category' keys
     """
-    enriched = []
+    # Updated in place: no per-row dict copy
     for source in sources:
-        url = source.get("url", "")
-        score, category = get_credibility_score(url)
-        enriched.append(
-            {
-                **source,
-                "credibility_score": score,
-                "credibility_category": category,
-            }
-        )
+        score, category = get_credibility_score(source.get("url", ""))
+        source["credibility_score"] = score
+        source["credibility_category"] = category
 
-    logger.debug(f"Enriched {len(sources)} sources with credibility scores")
-    return enriched
+    logger.debug("Enriched %s sources with credibility scores", len(sources))
+    return sources
 
 
 def sort_by_credibility(sources: list[dict], descending: bool = True) -> list[dict]:
@@ -181,7 +229,7 @@ def sort_by_credibility(sources: list[dict], descending: bool = True) -> list[di
     Sort sources by credibility score.
 
     Args:
-        sources: List of source dicts with 'credibility_score' key
+        sources: Source dicts; a missing 'credibility_score' counts as 0.5
         descending: If True, highest scores first
 
     Returns:
@@ -4,17 +4,24 @@ DSPy-compatible SearXNG Retriever
 Bridges DSPy and SearXNG for web search in AI pipelines.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 
 import dspy
-import requests
+import httpx
+import orjson
+from cachetools import TTLCache
 
 from app.core.config import settings
 from app.search.credibility import get_credibility_score
 
 logger = logging.getLogger(__name__)
 
+# SearXNG result fields the pipeline and services read
+_RESULT_FIELDS = ("title", "url", "content", "engine")
+
 
 class SearXNGRetriever(dspy.Retrieve):
     """DSPy retriever that uses SearXNG for web search"""
@@ -33,9 +40,22 @@ class SearXNGRetriever(dspy.Retrieve):
         super().__init__(k=k)
         self.searx_url = searx_url or settings.SEARXNG_URL
         self.language = language
-        self._last_results = []  # Store raw results with metadata
-
-    def forward(self, query: str, k: Optional[int] = None) -> List[str]:
+        # Pooled sync client (thread-safe) for retrieve() from worker threads
+        self._client = httpx.Client(
+            timeout=30.0, limits=httpx.Limits(max_keepalive_connections=8)
+        )
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Recent results keyed by (normalized query, k, language): related
+        # queries in one research session often repeat
+        self._cache: TTLCache = TTLCache(
+            maxsize=settings.RETRIEVAL_CACHE_SIZE, ttl=settings.RETRIEVAL_CACHE_TTL
+        )
+        self._cache_lock = threading.Lock()
+
+    def forward(
+        self, query: str, k: Optional[int] = None
+    ) -> Tuple[List[str], List[Dict]]:
         """
         Retrieve relevant passages from web via SearXNG
 
@@ -44,52 +64,144 @@ class SearXNGRetriever(dspy.Retrieve):
             k: Number of results (overrides instance k)
 
         Returns:
-            List of text passages with metadata
+            Tuple of (passages, raw_results), aligned by index
+        """
+        return self.retrieve(query, k)
+
+    def retrieve(
+        self, query: str, k: Optional[int] = None
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        Retrieve passages together with their raw, credibility-enriched results.
+
+        Holds no per-request instance state, so it is safe to call
+        concurrently from multiple threads.
+
+        Args:
+            query: Search query string
+            k: Number of results (overrides instance k)
+
+        Returns:
+            Tuple of (passages, raw_results), aligned by index
         """
-        k = k or self.k
+        key = self._cache_key(query, k)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
 
         try:
-            logger.info(f"Retrieving from SearXNG: {query}")
-
-            response = requests.get(
-                f"{self.searx_url}/search",
-                params={
-                    "q": query,
-                    "format": "json",
-                    "language": self.language,
-                    "safesearch": 1,
-                },
-                timeout=30,
+            logger.info("Retrieving from SearXNG: %s", query)
+
+            response = self._client.get(
+                f"{self.searx_url}/search", params=self._params(query)
             )
             response.raise_for_status()
+            return self._store(key, self._parse(orjson.loads(response.content), key[1]))
+
+        except Exception as e:
+            logger.error("SearXNG retrieval failed: %s", e)
+            return [], []
+
+    async def aretrieve(
+        self, query: str, k: Optional[int] = None
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        Async retrieve: awaits SearXNG on the event loop instead of a thread.
+
+        Uses a pooled httpx.AsyncClient, so repeat searches reuse connections.
+
+        Args:
+            query: Search query string
+            k: Number of results (overrides instance k)
+
+        Returns:
+            Tuple of (passages, raw_results), aligned by index
+        """
+        key = self._cache_key(query, k)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        try:
+            logger.info("Retrieving from SearXNG: %s", query)
 
-            data = response.json()
-            raw_results = data.get("results", [])[:k]
-
-            # Enrich results with credibility scores
-            self._last_results = []
-            for result in raw_results:
-                url = result.get("url", "")
-                score, category = get_credibility_score(url)
-                self._last_results.append(
-                    {
-                        **result,
-                        "credibility_score": score,
-                        "credibility_category": category,
-                    }
-                )
-
-            # Return passages as strings (DSPy expects List[str])
-            passages = []
-            for result in self._last_results:
-                # Combine title and content for better context
-                text = f"{result.get('title', '')}\n{result.get('content', '')}"
-                passages.append(text.strip())
-
-            logger.info(f"Retrieved {len(passages)} passages with credibility scores")
-            return passages
+            response = await self._async_client().get(
+                f"{self.searx_url}/search", params=self._params(query)
+            )
+            response.raise_for_status()
+            return self._store(key, self._parse(orjson.loads(response.content), key[1]))
 
         except Exception as e:
-            logger.error(f"SearXNG retrieval failed: {e}")
-            self._last_results = []
-            return []
+            logger.error("SearXNG retrieval failed: %s", e)
+            return [], []
+
+    def _cache_key(self, query: str, k: Optional[int]) -> Tuple[str, int, str]:
+        return query.strip().lower(), k or self.k, self.language
+
+    def _cached(self, key: Tuple) -> Optional[Tuple[List[str], List[Dict]]]:
+        """Recent results for key, or None (failures are never cached)."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Retrieval cache HIT: %s", key[0])
+        return cached
+
+    def _store(
+        self, key: Tuple, result: Tuple[List[str], List[Dict]]
+    ) -> Tuple[List[str], List[Dict]]:
+        with self._cache_lock:
+            self._cache[key] = result
+        return result
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Pooled async client, recreated if the event loop changed."""
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = httpx.AsyncClient(timeout=30.0)
+            self._aclient_loop = loop
+        return self._aclient
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients."""
+        self._client.close()
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    def _params(self, query: str) -> Dict:
+        """SearXNG query parameters."""
+        return {
+            "q": query,
+            "format": "json",
+            "language": self.language,
+            "safesearch": 1,
+        }
+
+    @staticmethod
+    def _parse(data: Dict, k: int) -> Tuple[List[str], List[Dict]]:
+        """Enrich the top-k results with credibility and build passages."""
+        raw_results = data.get("results", [])[:k]
+
+        # Keep only the fields downstream code reads (SearXNG results carry
+        # many more), enriched with credibility scores
+        enriched = []
+        for result in raw_results:
+            url = result.get("url", "")
+            score, category = get_credibility_score(url)
+            enriched.append(
+                {
+                    **{f: result[f] for f in _RESULT_FIELDS if f in result},
+                    "credibility_score": score,
+                    "credibility_category": category,
+                }
+            )
+
+        # Return passages as strings (DSPy expects List[str])
+        passages = []
+        for result in enriched:
+            # Combine title and content for better context
+            text = f"{result.get('title', '')}\n{result.get('content', '')}"
+            passages.append(text.strip())
+
+        logger.info("Retrieved %d passages with credibility scores", len(passages))
+        return passages, enriched
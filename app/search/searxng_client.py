@@ -8,8 +8,10 @@ import logging
 from typing import Dict, List, Optional
 
 import httpx
+import orjson
 
 from app.core.config import settings
+from app.core.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +27,6 @@ class SearXNGClient:
             base_url: SearXNG instance URL (defaults to settings)
         """
         self.base_url = base_url or settings.SEARXNG_URL
-        self.client = httpx.AsyncClient(timeout=30.0)
 
     async def search(
         self, query: str, limit: int = 10, language: str = "en"
@@ -45,7 +46,7 @@ class SearXNGClient:
             httpx.HTTPError: If search request fails
         """
         try:
-            logger.info(f"Searching SearXNG for: {query}")
+            logger.info("Searching SearXNG for: %s", query)
 
             # Prepare request
             params = {
@@ -56,11 +57,13 @@ class SearXNGClient:
             }
 
             # Make request
-            response = await self.client.get(f"{self.base_url}/search", params=params)
+            response = await get_http_client().get(
+                f"{self.base_url}/search", params=params
+            )
             response.raise_for_status()
 
-            # Parse response
-            data = response.json()
+            # Parse response (orjson straight from the body bytes)
+            data = orjson.loads(response.content)
             results = []
 
             for result in data.get("results", []):
@@ -73,19 +76,18 @@ class SearXNGClient:
                     }
                 )
 
-            logger.info(f"Found {len(results)} results")
+            logger.info("Found %s results", len(results))
             return results
 
         except httpx.HTTPError as e:
-            logger.error(f"SearXNG request failed: {e}")
+            logger.error("SearXNG request failed: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error parsing SearXNG response: {e}")
+            logger.error("Error parsing SearXNG response: %s", e)
             raise
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Release this client (the shared connection pool stays open)"""
 
     async def __aenter__(self):
         """Async context manager entry"""
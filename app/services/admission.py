@@ -0,0 +1,72 @@
+"""
+Admission Control
+
+Caps how many searches run the LLM pipeline at once.
+Single Responsibility: Only handles concurrency admission.
+"""
+
+import asyncio
+
+
+class AdmissionGate:
+    """
+    Counting gate built on asyncio.Condition.
+
+    Unlike a Semaphore, the limit can be resized at runtime: raising it
+    wakes waiters immediately, lowering it lets in-flight work drain.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize admission gate.
+
+        Args:
+            limit: Max concurrent holders (values below 1 are treated as 1)
+        """
+        self._limit = max(1, limit)
+        self._inflight = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def inflight(self) -> int:
+        """Number of current holders."""
+        return self._inflight
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return self._limit
+
+    async def acquire(self) -> None:
+        """Wait until below the limit, then take a slot."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < self._limit)
+            self._inflight += 1
+
+    async def release(self) -> None:
+        """
+        Give back a slot and wake one waiter.
+
+        The slot is returned before the first await, so a release cancelled
+        while waiting for the lock (e.g. a client disconnect) cannot leak it;
+        the wake-up is shielded for the same reason.
+        """
+        self._inflight -= 1
+        await asyncio.shield(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify(1)
+
+    async def resize(self, limit: int) -> None:
+        """Change the limit, admitting waiters if it grew."""
+        async with self._cond:
+            self._limit = max(1, limit)
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdmissionGate":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release()
@@ -7,16 +7,24 @@ Single Responsibility: Only handles search operations.
 
 import asyncio
 import logging
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import threading
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
 
 from app.ai.pipeline import DSPyPipeline
 from app.cache.redis_client import CacheClient, get_cache_client
+from app.core.config import settings
+from app.services.admission import AdmissionGate
 from app.utils.greeting import get_greeting_response, is_greeting
 
 logger = logging.getLogger(__name__)
 
 _search_service: Optional["SearchService"] = None
 
+# Pipelines shared by every SearchService (API routes and MCP tools alike),
+# one per retrieval depth
+_shared_pipelines: Dict[int, DSPyPipeline] = {}
+_shared_pipelines_lock = threading.Lock()
+
 
 class SearchService:
     """Centralized search service with caching and streaming."""
@@ -25,12 +33,15 @@ class SearchService:
         self,
         cache: Optional[CacheClient] = None,
         pipeline: Optional[DSPyPipeline] = None,
-        k_results: int = 5,
+        k_results: Optional[int] = None,
     ):
         """Initialize search service."""
         self._cache = cache
         self._pipeline = pipeline
-        self._k_results = k_results
+        # Deeper than RERANK_PREFILTER_K so the BM25 prefilter has work to do
+        self._k_results = k_results or settings.SEARCH_K_RESULTS
+        # Bounds concurrent pipeline runs (thread pool, LLM rate limits)
+        self._admission = AdmissionGate(settings.SEARCH_MAX_INFLIGHT)
 
     async def _get_cache(self) -> CacheClient:
         """Get cache client, initializing if needed."""
@@ -40,11 +51,32 @@ class SearchService:
 
     def _get_pipeline(self) -> DSPyPipeline:
         """Get or create DSPy pipeline (uses .env model configuration)."""
-        # CRITICAL: Always create fresh pipeline to ensure thread safety
-        # because SearXNGRetriever instances are stateful across requests
-        if self._pipeline:
-            return self._pipeline
-        return DSPyPipeline(k_results=self._k_results)
+        # One shared pipeline: the retriever is stateless and LMs are bound
+        # per call via dspy.context, so concurrent requests are safe
+        if self._pipeline is None:
+            self._pipeline = _get_shared_pipeline(self._k_results)
+        return self._pipeline
+
+    async def _aget_pipeline(self) -> DSPyPipeline:
+        """_get_pipeline, building the pipeline off the event loop on first use."""
+        if self._pipeline is None:
+            # Construction creates LM clients; keep it from stalling the loop
+            return await asyncio.to_thread(self._get_pipeline)
+        return self._pipeline
+
+    async def aclose(self) -> None:
+        """Close the pipeline retriever's pooled SearXNG connections."""
+        if self._pipeline is not None:
+            await self._pipeline.retriever.aclose()
+
+    def warm_up(self) -> bool:
+        """Build the DSPy pipeline ahead of the first request."""
+        try:
+            self._get_pipeline()
+            return True
+        except ValueError as e:
+            logger.warning("Pipeline not initialized: %s", e)
+            return False
 
     async def search(
         self,
@@ -53,7 +85,7 @@ class SearchService:
         include_context: bool = True,
     ) -> Dict[str, Any]:
         """Perform a search with caching."""
-        logger.info(f"SearchService.search: {query[:50]}...")
+        logger.info("SearchService.search: %s...", query[:50])
 
         # Handle greetings
         if is_greeting(query):
@@ -61,34 +93,87 @@ class SearchService:
             return get_greeting_response()
 
         cache = await self._get_cache()
+        cache_key = cache.key_for(query)
 
         if not skip_cache:
-            cached_result = await cache.get(query)
-            if cached_result:
+            cached_result = await cache.get_by_key(cache_key)
+            # Results cached without context can't serve requests that want it
+            if cached_result and (
+                not include_context or cached_result.get("context") is not None
+            ):
                 logger.info("Returning cached result")
                 return self._format_result(cached_result, True, include_context)
 
         try:
-            pipeline = self._get_pipeline()
-            # Auto-detect complex queries and use decomposition
-            if pipeline._is_complex_query(query):
-                logger.info("🔀 Using complex_search for multi-aspect query")
-                result = pipeline.complex_search(query)
-            else:
-                result = pipeline.search_and_answer(query)
-
-            # Add model info to result
-            result["model_used"] = pipeline._model_name
-
-            await cache.set(query, result)
+            pipeline = await self._aget_pipeline()
+            async with self._admission:
+                # Auto-detect complex queries and use decomposition
+                if pipeline._is_complex_query(query):
+                    logger.info("🔀 Using complex_search for multi-aspect query")
+                    result = await pipeline.acomplex_search(query, include_context)
+                else:
+                    result = await pipeline.asearch_and_answer(query, include_context)
+
+            # Add model info to result (cascade routing may have picked another)
+            result.setdefault("model_used", pipeline._model_name)
+
+            await cache.set_by_key(cache_key, result)
             return self._format_result(result, False, include_context)
 
         except ValueError:
             raise
         except Exception as e:
-            logger.error(f"Search failed: {e}")
+            logger.error("Search failed: %s", e)
             raise
 
+    async def search_batch(
+        self,
+        queries: List[str],
+        skip_cache: bool = False,
+        include_context: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer many queries; uncached ones share batched LLM stages.
+
+        Goes through the pipeline's semantic cache, cascade routing and fused
+        stage like search(), but complex queries are not decomposed.
+        """
+        logger.info("SearchService.search_batch: %s queries", len(queries))
+        cache = await self._get_cache()
+        results: List[Dict[str, Any]] = [{}] * len(queries)
+        pending: List[int] = []
+
+        cached = {} if skip_cache else await cache.get_many(queries)
+        for i, query in enumerate(queries):
+            if is_greeting(query):
+                results[i] = get_greeting_response()
+                continue
+            cached_result = cached.get(query)
+            if cached_result and (
+                not include_context or cached_result.get("context") is not None
+            ):
+                results[i] = self._format_result(cached_result, True, include_context)
+                continue
+            pending.append(i)
+
+        if pending:
+            pipeline = await self._aget_pipeline()
+            async with self._admission:
+                answers = await asyncio.to_thread(
+                    pipeline.search_and_answer_multi,
+                    [queries[i] for i in pending],
+                    include_context,
+                )
+            fresh: Dict[str, Dict[str, Any]] = {}
+            for i, result in zip(pending, answers):
+                result.setdefault("model_used", pipeline._model_name)
+                if result.get("sources"):
+                    fresh[queries[i]] = result
+                results[i] = self._format_result(result, False, include_context)
+            await cache.set_many(fresh)
+
+        return results
+
     def _format_result(
         self,
         result: Dict[str, Any],
@@ -116,8 +201,7 @@ class SearchService:
         if is_greeting(query):
             greeting = get_greeting_response()
             yield {"type": "status", "message": "👋 Welcome!"}
-            async for event in self._stream_words(greeting["answer"]):
-                yield event
+            yield {"type": "token", "content": greeting["answer"]}
             yield {
                 "type": "done",
                 "sources": [],
@@ -129,14 +213,14 @@ class SearchService:
             return
 
         cache = await self._get_cache()
+        cache_key = cache.key_for(query)
         model_used = "unknown"
 
         if not skip_cache:
-            cached_result = await cache.get(query)
+            cached_result = await cache.get_by_key(cache_key)
             if cached_result:
                 yield {"type": "status", "message": "Found cached result"}
-                async for event in self._stream_words(cached_result.get("answer", "")):
-                    yield event
+                yield {"type": "token", "content": cached_result.get("answer", "")}
                 yield {
                     "type": "done",
                     "sources": cached_result.get("sources", []),
@@ -148,20 +232,34 @@ class SearchService:
         yield {"type": "status", "message": "Searching the web..."}
 
         try:
-            pipeline = self._get_pipeline()
+            pipeline = await self._aget_pipeline()
             model_used = pipeline._model_name
         except ValueError as e:
             yield {"type": "error", "message": f"Configuration error: {str(e)}"}
             return
 
         yield {"type": "status", "message": "Analyzing sources..."}
-        result = pipeline.search_and_answer(query)
-
-        yield {"type": "status", "message": "Generating answer..."}
-        async for event in self._stream_words(result.get("answer", "")):
-            yield event
+        result: Dict[str, Any] = {}
+        # The pipeline pumps into a queue under the admission gate, so the
+        # slot is freed when generation ends, not when a slow client drains
+        events: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(
+            self._pump_events(pipeline.astream_answer(query), events)
+        )
+        try:
+            while (event := await events.get()) is not None:
+                if isinstance(event, BaseException):
+                    raise event
+                if event["type"] == "result":
+                    result = event["result"]
+                else:
+                    yield event
+                    if event["type"] == "error":
+                        return
+        finally:
+            producer.cancel()
 
-        await cache.set(query, result)
+        await cache.set_by_key(cache_key, result)
 
         yield {
             "type": "done",
@@ -169,26 +267,28 @@ class SearchService:
             "confidence": result.get("confidence", 0),
             "context": result.get("context", []),
             "cached": False,
-            "model_used": model_used,
+            "model_used": result.get("model_used", model_used),
         }
 
-    async def _stream_words(
-        self,
-        text: str,
-        delay: float = 0.03,
-    ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Stream text word by word."""
-        for word in text.split():
-            yield {"type": "token", "content": word + " "}
-            await asyncio.sleep(delay)
+    async def _pump_events(
+        self, stream: AsyncIterator[Dict[str, Any]], events: asyncio.Queue
+    ) -> None:
+        """Drain a pipeline event stream into a queue while holding a slot."""
+        try:
+            async with self._admission:
+                async for event in stream:
+                    events.put_nowait(event)
+        except Exception as e:
+            events.put_nowait(e)
+        finally:
+            events.put_nowait(None)
 
     async def get_sources(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """Get raw sources without AI synthesis."""
-        logger.info(f"SearchService.get_sources: {query[:50]}...")
+        logger.info("SearchService.get_sources: %s...", query[:50])
         try:
-            pipeline = self._get_pipeline()
-            _ = pipeline.retriever(query)
-            raw_results = getattr(pipeline.retriever, "_last_results", [])
+            pipeline = await self._aget_pipeline()
+            _, raw_results = await pipeline.retriever.aretrieve(query, k=limit)
 
             sources = [
                 {
@@ -202,12 +302,12 @@ class SearchService:
 
             return {"query": query, "sources": sources, "total_found": len(raw_results)}
         except Exception as e:
-            logger.error(f"get_sources failed: {e}")
+            logger.error("get_sources failed: %s", e)
             return {"error": str(e), "query": query, "sources": []}
 
     async def research_topic(self, topic: str, depth: int = 3) -> Dict[str, Any]:
         """Deep research on a topic."""
-        logger.info(f"SearchService.research_topic: {topic} (depth={depth})")
+        logger.info("SearchService.research_topic: %s (depth=%s)", topic, depth)
         depth = max(1, min(5, depth))
 
         related_queries = [
@@ -218,23 +318,62 @@ class SearchService:
             f"how does {topic} work",
         ][:depth]
 
-        results: List[Dict[str, Any]] = []
-        all_sources: List[str] = []
+        # One MGET checks every related query; only misses run a search
+        cache = await self._get_cache()
+        cached = await cache.get_many(related_queries)
+
+        # Misses run concurrently (the admission gate still bounds pipeline
+        # runs); only answers and sources are used
+        fresh = iter(
+            await asyncio.gather(
+                *(
+                    self.search(q, skip_cache=True, include_context=False)
+                    for q in related_queries
+                    if q not in cached
+                ),
+                return_exceptions=True,
+            )
+        )
+        outcomes = [cached.get(q) or next(fresh) for q in related_queries]
+        failures = [o for o in outcomes if isinstance(o, BaseException)]
+        if len(failures) == len(outcomes):
+            raise failures[0]
 
-        for query in related_queries:
-            result = await self.search(query)
-            if "error" not in result:
+        results: List[Dict[str, Any]] = []
+        # Keyed by URL in first-seen order, so ranking survives the top-10
+        # cut; sources may be URL strings or source dicts
+        seen_sources: Dict[str, Any] = {}
+
+        for query, result in zip(related_queries, outcomes):
+            if isinstance(result, BaseException):
+                logger.warning("Research query failed: %s (%s)", query, result)
+            elif "error" not in result:
                 results.append({"query": query, "answer": result.get("answer", "")})
-                all_sources.extend(result.get("sources", []))
+                for source in result.get("sources", []):
+                    url = source.get("url", "") if isinstance(source, dict) else source
+                    seen_sources.setdefault(url, source)
 
         return {
             "topic": topic,
             "research": results,
-            "sources": list(set(all_sources))[:10],
+            "sources": list(seen_sources.values())[:10],
             "queries_explored": len(results),
         }
 
 
+def _get_shared_pipeline(k_results: int) -> DSPyPipeline:
+    """Get or create the process-wide pipeline for a result count."""
+    pipeline = _shared_pipelines.get(k_results)
+    if pipeline is None:
+        with _shared_pipelines_lock:
+            pipeline = _shared_pipelines.get(k_results)
+            if pipeline is None:
+                pipeline = _shared_pipelines[k_results] = DSPyPipeline(
+                    k_results=k_results
+                )
+    return pipeline
+
+
 async def get_search_service() -> SearchService:
     """Get or create global search service."""
     global _search_service
@@ -6,18 +6,56 @@ Generates AI-powered search query suggestions:
 - For returning users: Personalized based on search history
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+import re
+import threading
+import time
+from functools import lru_cache
+from itertools import chain, islice, zip_longest
+from typing import List, Optional, Tuple
 
 import dspy
-import httpx
+import orjson
 
 from app.ai.llm_providers import create_llm
 from app.ai.signatures import SuggestionGenerator
 from app.core.config import settings
+from app.core.http import get_http_client
 
 logger = logging.getLogger("searchflow")
 
+# A suggestion line: over 5 characters once surrounding whitespace is removed
+_LINE_RE = re.compile(r"^[^\S\n]*(\S.{4,}\S)[^\S\n]*$", re.M)
+
+# Searched together for new-user context, so suggestions span several areas
+_TRENDING_QUERIES = (
+    "latest technology news trends 2024",
+    "latest AI developments",
+    "web development news",
+    "cloud computing news",
+)
+
+# Served when the LLM is unavailable (never cached)
+FALLBACK_SUGGESTIONS = (
+    "What are the latest features in Next.js?",
+    "Explain quantum computing simply",
+    "Best practices for React performance",
+    "How does a transformer model work?",
+    "Compare Python vs Rust for backend",
+)
+
+# New-user LLM context when SearXNG is unreachable or returns no titles
+FALLBACK_TRENDING_TOPICS = (
+    "AI developments, web frameworks, cloud computing, cybersecurity, data science"
+)
+
+
+@lru_cache(maxsize=1024)
+def _join_history(history: Tuple[str, ...]) -> str:
+    """LLM context for a history (memoized: sessions resend the same one)."""
+    return "\n".join(history)
+
 
 class SuggestionService:
     """Generate personalized search suggestions using AI."""
@@ -25,39 +63,95 @@ class SuggestionService:
     def __init__(self):
         """Initialize the suggestion service with LLM."""
         self._lm = self._init_lm()
-        self.generator = dspy.Predict(SuggestionGenerator)
+        # Shared across instances; each call passes this service's LM, which
+        # outranks the global default, so no per-request dspy.context
+        self.generator = self._shared_generator()
+        # Async wrapper: runs the LLM call on DSPy's worker pool
+        self._agenerator = dspy.asyncify(self.generator)
+        # (fetched_at, topics): every new-user request asks the same query
+        self._trending: Optional[Tuple[float, str]] = None
+        self._trending_lock = asyncio.Lock()
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _shared_generator(cls) -> dspy.Predict:
+        """Stateless predictor for SuggestionGenerator, built once."""
+        return dspy.Predict(SuggestionGenerator)
 
     def _init_lm(self) -> dspy.LM:
         """Initialize the language model using centralized provider."""
         return create_llm()
 
-    async def _fetch_trending_topics(self) -> str:
-        """Fetch trending tech topics using SearXNG."""
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{settings.SEARXNG_URL}/search",
-                    params={
-                        "q": "latest technology news trends 2024",
-                        "format": "json",
-                        "categories": "it,science",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract titles from top results
-                results = data.get("results", [])[:10]
-                topics = [r.get("title", "") for r in results if r.get("title")]
-                return (
-                    "\n".join(topics[:8])
-                    if topics
-                    else "AI, machine learning, web development"
-                )
+    async def warm_up(self) -> None:
+        """Fetch trending topics ahead of the first new-user request."""
+        await self._fetch_trending_topics()
 
-        except Exception as e:
-            logger.warning(f"Failed to fetch trending topics: {e}")
-            return "AI developments, web frameworks, cloud computing, cybersecurity, data science"
+    async def aclose(self) -> None:
+        """
+        Drop cached trending topics.
+
+        The HTTP pool is shared and closed by close_http_client(); the
+        trending lock belongs to this event loop, so the service is not reused.
+        """
+        self._trending = None
+
+    async def _fetch_trending_topics(self) -> str:
+        """Fetch trending tech topics using SearXNG (cached for a while)."""
+        topics = self._cached_trending()
+        if topics is not None:
+            return topics
+
+        # Single flight: concurrent misses wait for one upstream request
+        async with self._trending_lock:
+            topics = self._cached_trending()
+            if topics is not None:
+                return topics
+            try:
+                topics = await self._request_trending_topics()
+            except Exception as e:
+                logger.warning("Failed to fetch trending topics: %s", e)
+                return FALLBACK_TRENDING_TOPICS
+            self._trending = (time.monotonic(), topics)
+            return topics
+
+    def _cached_trending(self) -> Optional[str]:
+        """Trending topics fetched within TRENDING_CACHE_TTL, if any."""
+        if self._trending is not None:
+            fetched_at, topics = self._trending
+            if time.monotonic() - fetched_at < settings.TRENDING_CACHE_TTL:
+                return topics
+        return None
+
+    async def _request_trending_topics(self) -> str:
+        """Query SearXNG for trending topics (raises if every query fails)."""
+        # Complementary queries run concurrently over the pooled client
+        outcomes = await asyncio.gather(
+            *(self._request_titles(q) for q in _TRENDING_QUERIES),
+            return_exceptions=True,
+        )
+        title_lists = [o for o in outcomes if not isinstance(o, BaseException)]
+        if not title_lists:
+            raise outcomes[0]
+
+        # Interleave so each query contributes, then dedupe in order
+        interleaved = chain.from_iterable(zip_longest(*title_lists))
+        topics = list(dict.fromkeys(t for t in interleaved if t))[:8]
+        return "\n".join(topics) if topics else FALLBACK_TRENDING_TOPICS
+
+    async def _request_titles(self, query: str) -> List[str]:
+        """Titles of the top SearXNG results for one trending query."""
+        # Process-wide client: keep-alive connections to SearXNG are reused
+        response = await get_http_client().get(
+            f"{settings.SEARXNG_URL}/search",
+            params={"q": query, "format": "json", "categories": "it,science"},
+            timeout=10.0,
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        # Titles of the top results, stopping at the 8 the context can use
+        titles = (r.get("title") for r in data.get("results", [])[:10])
+        return list(islice(filter(None, titles), 8))
 
     def generate_suggestions(
         self,
@@ -66,22 +160,17 @@ class SuggestionService:
         """Generate search suggestions synchronously."""
         try:
             user_type = "returning" if history and len(history) > 0 else "new"
-            context = "\n".join(history[:10]) if history else ""
+            context = _join_history(tuple(islice(history, 10))) if history else ""
 
-            with dspy.context(lm=self._lm):
-                result = self.generator(context=context, user_type=user_type)
+            result = self.generator(context=context, user_type=user_type, lm=self._lm)
 
             # Parse suggestions (one per line)
-            suggestions = [
-                line.strip()
-                for line in result.suggestions.strip().split("\n")
-                if line.strip() and len(line.strip()) > 5
-            ]
+            suggestions = _LINE_RE.findall(result.suggestions)
 
             return suggestions[:5] if suggestions else self._fallback_suggestions()
 
         except Exception as e:
-            logger.error(f"Suggestion generation failed: {e}")
+            logger.error("Suggestion generation failed: %s", e)
             return self._fallback_suggestions()
 
     async def generate_suggestions_async(
@@ -96,42 +185,46 @@ class SuggestionService:
             if user_type == "new":
                 context = await self._fetch_trending_topics()
             else:
-                context = "\n".join(history[:10]) if history else ""
+                context = _join_history(tuple(islice(history, 10))) if history else ""
 
-            with dspy.context(lm=self._lm):
-                result = self.generator(context=context, user_type=user_type)
+            # Awaited off the event loop so other requests keep being served
+            result = await self._agenerator(
+                context=context, user_type=user_type, lm=self._lm
+            )
 
             # Parse suggestions (one per line)
-            suggestions = [
-                line.strip()
-                for line in result.suggestions.strip().split("\n")
-                if line.strip() and len(line.strip()) > 5
-            ]
+            suggestions = _LINE_RE.findall(result.suggestions)
 
             return suggestions[:5] if suggestions else self._fallback_suggestions()
 
         except Exception as e:
-            logger.error(f"Suggestion generation failed: {e}")
+            logger.error("Suggestion generation failed: %s", e)
             return self._fallback_suggestions()
 
     def _fallback_suggestions(self) -> List[str]:
         """Return fallback suggestions if AI fails."""
-        return [
-            "What are the latest features in Next.js?",
-            "Explain quantum computing simply",
-            "Best practices for React performance",
-            "How does a transformer model work?",
-            "Compare Python vs Rust for backend",
-        ]
+        return list(FALLBACK_SUGGESTIONS)
 
 
 # Singleton instance
 _suggestion_service: Optional[SuggestionService] = None
+_suggestion_service_lock = threading.Lock()
 
 
 def get_suggestion_service() -> SuggestionService:
     """Get or create the suggestion service singleton."""
     global _suggestion_service
     if _suggestion_service is None:
-        _suggestion_service = SuggestionService()
+        with _suggestion_service_lock:
+            if _suggestion_service is None:
+                _suggestion_service = SuggestionService()
     return _suggestion_service
+
+
+async def close_suggestion_service() -> None:
+    """Close the suggestion service singleton so a new loop builds a fresh one."""
+    global _suggestion_service
+
+    if _suggestion_service:
+        await _suggestion_service.aclose()
+        _suggestion_service = None
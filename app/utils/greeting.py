@@ -4,6 +4,9 @@ Greeting Detection
 Detects greetings and casual conversation.
 """
 
+import re
+import string
+
 GREETING_PATTERNS = [
     "hi",
     "hello",
@@ -34,41 +37,61 @@ CASUAL_PATTERNS = [
 ]
 
 
+def _alternation(patterns: list) -> re.Pattern:
+    return re.compile("|".join(map(re.escape, patterns)))
+
+
+# Compiled once, so a query's prefix is checked in one pass
+_PREFIX_RE = _alternation(GREETING_PATTERNS + CASUAL_PATTERNS)
+
+# Single-word greetings are looked up per token; phrases are searched for
+_SINGLE_GREETINGS = frozenset(g for g in GREETING_PATTERNS if " " not in g)
+_PHRASE_RE = _alternation([g for g in GREETING_PATTERNS if " " in g])
+
+
 def is_greeting(query: str) -> bool:
     """Check if query is a greeting or casual conversation."""
-    query_lower = query.lower().strip()
+    # Chat input is usually already lowercase ASCII; skip the copy then
+    if query.isascii() and query.islower():
+        query_lower = query.strip()
+    else:
+        query_lower = query.lower().strip()
 
     # Exact match or starts with greeting
-    for pattern in GREETING_PATTERNS + CASUAL_PATTERNS:
-        if query_lower == pattern or query_lower.startswith(pattern):
-            return True
+    if _PREFIX_RE.match(query_lower):
+        return True
 
     # Short queries that are likely greetings
-    if len(query_lower.split()) <= 3:
-        for pattern in GREETING_PATTERNS:
-            if pattern in query_lower:
-                return True
+    tokens = query_lower.split()
+    if len(tokens) > 3:
+        return False
+    return any(
+        t.strip(string.punctuation) in _SINGLE_GREETINGS for t in tokens
+    ) or bool(_PHRASE_RE.search(query_lower))
+
 
-    return False
+# Constant reply, built once
+_GREETING_RESPONSE = {
+    "question": "greeting",
+    "answer": (
+        "## 👋 Hello! I'm SearchFlow\n\n"
+        "I search the web and provide **structured, well-researched answers** "
+        "with proper citations.\n\n"
+        "### What I can help you with:\n"
+        "- 🔍 **Research questions** - Get comprehensive answers with sources\n"
+        "- 💻 **Technical comparisons** - Compare technologies, frameworks, tools\n"
+        "- 📚 **Learning topics** - Understand complex concepts explained simply\n"
+        "- 🚀 **Latest updates** - Find current information on any topic\n\n"
+        "**Try asking me something below, or pick a suggested question!**"
+    ),
+    "context": [],
+    "confidence": 1.0,
+    "sources": [],
+    "is_greeting": True,
+}
 
 
 def get_greeting_response() -> dict:
     """Generate greeting response with suggestions."""
-    return {
-        "question": "greeting",
-        "answer": (
-            "## 👋 Hello! I'm SearchFlow\n\n"
-            "I search the web and provide **structured, well-researched answers** "
-            "with proper citations.\n\n"
-            "### What I can help you with:\n"
-            "- 🔍 **Research questions** - Get comprehensive answers with sources\n"
-            "- 💻 **Technical comparisons** - Compare technologies, frameworks, tools\n"
-            "- 📚 **Learning topics** - Understand complex concepts explained simply\n"
-            "- 🚀 **Latest updates** - Find current information on any topic\n\n"
-            "**Try asking me something below, or pick a suggested question!**"
-        ),
-        "context": [],
-        "confidence": 1.0,
-        "sources": [],
-        "is_greeting": True,
-    }
+    # Shallow copy: callers only read it, but may add keys to the top level
+    return dict(_GREETING_RESPONSE)
@@ -4,9 +4,19 @@ Text Utility Functions
 This module provides helper functions for text processing.
 """
 
+import logging
+from functools import lru_cache
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+_ELLIPSIS = "..."
+
 
 def clean_text(text: str) -> str:
     """Remove extra whitespace and normalize text"""
+    # split()/join beats re.sub(r"\s+", " ", ...).strip() severalfold here,
+    # with identical output (both use str.isspace)
     return " ".join(text.split())
 
 
@@ -14,4 +24,42 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     """Truncate text to a maximum length"""
     if len(text) <= max_length:
         return text
-    return text[:max_length] + "..."
+    return f"{text[:max_length]}{_ELLIPSIS}"
+
+
+def truncate_many(texts: List[str], max_length: int = 100) -> List[str]:
+    """truncate_text over many texts (short ones are returned as-is)"""
+    return [
+        t if len(t) <= max_length else f"{t[:max_length]}{_ELLIPSIS}" for t in texts
+    ]
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None if unavailable (e.g. offline)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("tiktoken unavailable, estimating tokens: %s", e)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text (falls back to ~4 chars per token)"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
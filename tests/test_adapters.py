@@ -0,0 +1,30 @@
+"""
+DSPy Adapter Tests
+
+Tests for the precompiled system-prompt adapter (no LLM calls).
+"""
+
+import dspy
+from dspy.adapters.chat_adapter import ChatAdapter
+
+from app.ai.adapters import PrecompiledChatAdapter
+from app.ai.signatures import SearchQA
+
+
+def test_system_message_matches_chat_adapter():
+    """Test memoized system message is identical to ChatAdapter's"""
+    signature = dspy.ChainOfThought(SearchQA).predict.signature
+    adapter = PrecompiledChatAdapter()
+    expected = ChatAdapter().format_system_message(signature)
+
+    assert adapter.format_system_message(signature) == expected
+    assert (
+        adapter.format_system_message(signature) is adapter._system_messages[signature]
+    )
+
+
+def test_warm_renders_all_predictors():
+    """Test warm pre-renders a system message per predictor signature"""
+    adapter = PrecompiledChatAdapter()
+    adapter.warm(dspy.ChainOfThought(SearchQA))
+    assert len(adapter._system_messages) == 1
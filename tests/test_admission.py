@@ -0,0 +1,67 @@
+"""
+Admission Control Tests
+
+Tests for the asyncio.Condition-based concurrency gate.
+"""
+
+import asyncio
+
+from app.services.admission import AdmissionGate
+
+
+def test_gate_caps_concurrency():
+    """Test no more than limit holders run at once"""
+    gate = AdmissionGate(2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with gate:
+            peak = max(peak, gate.inflight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert gate.inflight == 0
+
+
+def test_gate_resize_admits_waiters():
+    """Test raising the limit lets queued holders in"""
+    gate = AdmissionGate(1)
+
+    async def run():
+        await gate.acquire()
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await gate.resize(2)
+        await asyncio.wait_for(waiter, 1)
+        return gate.inflight
+
+    assert asyncio.run(run()) == 2
+
+
+def test_cancelled_release_still_frees_slot():
+    """Test a release cancelled while the lock is contended returns its slot"""
+    gate = AdmissionGate(1)
+
+    async def run():
+        await gate.acquire()
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+
+        await gate._cond.acquire()  # Contend the lock release needs
+        releasing = asyncio.create_task(gate.release())
+        await asyncio.sleep(0)
+        releasing.cancel()
+        await asyncio.sleep(0)
+        freed = gate.inflight
+        gate._cond.release()
+
+        await asyncio.wait_for(waiter, 1)
+        return freed, releasing.cancelled(), gate.inflight
+
+    assert asyncio.run(run()) == (0, True, 1)
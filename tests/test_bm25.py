@@ -0,0 +1,22 @@
+"""
+BM25 Scoring Tests
+
+Tests for the lexical prefilter used before LLM reranking.
+"""
+
+from app.search.bm25 import bm25_scores
+
+
+def test_bm25_ranks_matching_passage_highest():
+    """Test passages containing query terms outscore unrelated ones"""
+    scores = bm25_scores(
+        "python asyncio tutorial",
+        ["Cooking pasta at home", "An asyncio tutorial for Python", "Python"],
+    )
+    assert scores.index(max(scores)) == 1
+    assert scores[0] == 0.0
+
+
+def test_bm25_empty_documents():
+    """Test scoring an empty passage list"""
+    assert bm25_scores("python", []) == []
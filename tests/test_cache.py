@@ -0,0 +1,222 @@
+"""
+Cache Client Tests
+
+Tests for CacheClient key generation and suggestion caching
+(in-memory stand-in for Redis).
+"""
+
+import asyncio
+
+from app.cache.redis_client import CacheClient
+
+
+class MemoryRedis:
+    """Minimal async get/setex store"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    """Queues commands and runs them against the store on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.queued.append(lambda: self.redis.setex(key, ttl, value))
+
+    def info(self, section):
+        self.queued.append(lambda: self.redis.info(section))
+
+    def dbsize(self):
+        self.queued.append(self.redis.dbsize)
+
+    async def execute(self):
+        return [await command() for command in self.queued]
+
+
+def make_client() -> CacheClient:
+    client = CacheClient()
+    client._redis = MemoryRedis()
+    client._connected = True
+    return client
+
+
+def test_suggestions_key_uses_visible_history():
+    """Test only the first 10 history entries (stripped) affect the key"""
+    client = CacheClient()
+    history = [f"query {i}" for i in range(12)]
+    assert client._suggestions_key(history) == client._suggestions_key(
+        [f" {h} " for h in history[:10]]
+    )
+    assert client._suggestions_key(["a"]) != client._suggestions_key(["b"])
+
+
+def test_suggestions_key_ignores_order_and_case():
+    """Test reordered or re-cased histories share one suggestions entry"""
+    client = CacheClient()
+    assert client._suggestions_key(["Rust async", "python"]) == (
+        client._suggestions_key(["python", "rust async"])
+    )
+
+
+def test_suggestions_roundtrip():
+    """Test stored suggestions are returned for the same history"""
+    client = make_client()
+
+    async def run():
+        assert await client.get_suggestions(["rust"]) is None
+        assert await client.set_suggestions(["rust"], ["Rust async?"])
+        return await client.get_suggestions(["rust"])
+
+    assert asyncio.run(run()) == ["Rust async?"]
+
+
+def test_set_many_then_get_many():
+    """Test bulk writes are readable in one MGET, misses omitted"""
+    client = make_client()
+
+    async def run():
+        await client.set_many({"python": {"answer": "A"}, "rust": {"answer": "B"}})
+        return await client.get_many(["python", "go", "rust"])
+
+    hits = asyncio.run(run())
+    assert sorted(hits) == ["python", "rust"]
+    assert hits["python"]["answer"] == "A"
+    assert hits["python"]["_cached"] is True
+
+
+def test_connect_uses_blocking_pool():
+    """Test the client is built on a sized BlockingConnectionPool"""
+    from redis.asyncio import BlockingConnectionPool
+
+    client = CacheClient("redis://127.0.0.1:1")
+    client.enabled = True
+
+    async def run():
+        connected = await client.connect()
+        pool = client._redis.connection_pool
+        await client.disconnect()
+        return connected, pool
+
+    connected, pool = asyncio.run(run())
+    assert connected is False
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == 64
+
+
+def test_local_tier_serves_repeat_reads():
+    """Test hot results are served in-process without a Redis round-trip"""
+    client = make_client()
+
+    async def run():
+        await client.set("python", {"answer": "A"})
+        client._redis.data.clear()
+        local = await client.get("Python ")
+        await client.delete("python")
+        return local, await client.get("python")
+
+    local, after_delete = asyncio.run(run())
+    assert local["answer"] == "A"
+    assert after_delete is None
+
+
+def test_key_for_matches_query_api():
+    """Test a precomputed key reads and writes the same entry as the query"""
+    client = make_client()
+    key = client.key_for("  Python ")
+
+    async def run():
+        await client.set_by_key(key, {"answer": "A"})
+        client._local.clear()
+        return await client.get("python")
+
+    assert key == client.key_for("python")
+    assert asyncio.run(run())["_cache_key"] == key
+
+
+def test_search_serves_stored_body_on_repeat(monkeypatch):
+    """Test /search stores its response bytes and replays them on a hit"""
+    from fastapi.testclient import TestClient
+
+    import app.api.routes as routes
+    from app.main import app
+
+    client = make_client()
+    calls = []
+
+    class Service:
+        async def search(self, query, skip_cache, include_context):
+            calls.append(query)
+            return {
+                "question": query,
+                "answer": "A",
+                "confidence": 0.9,
+                "sources": ["https://a.org"],
+                "context": [],
+                "cached": False,
+            }
+
+    async def get_cache():
+        return client
+
+    async def get_service():
+        return Service()
+
+    monkeypatch.setattr(routes, "get_cache_client", get_cache)
+    monkeypatch.setattr(routes, "get_search_service", get_service)
+    http = TestClient(app)
+
+    first = http.post("/api/v1/search", json={"query": "rust"}).json()
+    second = http.post("/api/v1/search", json={"query": "rust"}).json()
+    assert calls == ["rust"]
+    assert first["cached"] is False
+    assert second == {**first, "cached": True}
+
+
+def test_stats_reused_within_max_age():
+    """Test health-probe stats are served from memory inside max_age"""
+    client = make_client()
+    calls = []
+
+    async def info(section):
+        calls.append(section)
+        return {"used_memory_human": "1M"}
+
+    async def dbsize():
+        return 3
+
+    client._redis.info = info
+    client._redis.dbsize = dbsize
+
+    async def run():
+        await client.get_stats(max_age=60)
+        await client.get_stats(max_age=60)
+        return await client.get_stats()
+
+    assert asyncio.run(run())["total_keys"] == 3
+    assert calls == ["memory", "memory"]
@@ -0,0 +1,35 @@
+"""
+Prompt Compression Tests
+
+Tests for extractive passage compression.
+"""
+
+from app.ai.compression import compress_passage, compress_passages
+
+PASSAGE = (
+    "Python Guide\n"
+    "Python was created by Guido van Rossum. "
+    "The weather today is sunny. "
+    "Python emphasizes readability. "
+    "Bananas are yellow."
+)
+
+
+def test_compress_keeps_title_and_relevant_sentences():
+    """Test the title survives and relevant sentences are preferred"""
+    compressed = compress_passage("who created python", PASSAGE, ratio=0.5)
+    assert compressed.startswith("Python Guide")
+    assert "Guido van Rossum" in compressed
+    assert "Bananas" not in compressed
+
+
+def test_compress_short_passage_unchanged():
+    """Test passages with too few sentences are returned as-is"""
+    assert compress_passage("python", "Title\nOne sentence.") == "Title\nOne sentence."
+
+
+def test_compress_passages_only_touches_selected():
+    """Test only the selected indices are compressed"""
+    out = compress_passages("who created python", [PASSAGE, PASSAGE], [1])
+    assert out[0] == PASSAGE
+    assert len(out[1]) < len(PASSAGE)
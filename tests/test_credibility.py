@@ -0,0 +1,105 @@
+"""
+Credibility Scoring Tests
+
+Tests for domain reputation lookups.
+"""
+
+from app.search.credibility import get_credibility_score
+
+
+def test_known_domain_and_subdomain():
+    """Test exact and subdomain matches use the known domain's score"""
+    assert get_credibility_score("https://github.com/x") == (0.90, "code_repository")
+    assert get_credibility_score("https://docs.github.com") == (
+        0.90,
+        "code_repository",
+    )
+    assert get_credibility_score("https://notgithub.com")[1] == "general"
+
+
+def test_trusted_tld_fallback():
+    """Test unknown domains under a trusted TLD get the TLD score"""
+    assert get_credibility_score("https://mit.edu") == (0.90, "trusted_tld_.edu")
+    assert get_credibility_score("https://en.wikipedia.org")[1] == "encyclopedia"
+
+
+def test_known_domain_overrides_its_tld():
+    """Test the deepest suffix wins and a bare TLD gets no TLD score"""
+    assert get_credibility_score("https://freecodecamp.org")[1] == "educational"
+    assert get_credibility_score("https://a.b.python.org") == (
+        0.70,
+        "trusted_tld_.org",
+    )
+    assert get_credibility_score("https://org") == (0.55, "general")
+
+
+def test_low_quality_and_default():
+    """Test low-quality patterns and the default for unknown domains"""
+    assert get_credibility_score("https://free-stuff.net") == (0.30, "low_quality")
+    assert get_credibility_score("https://example.com") == (0.55, "general")
+
+
+def test_repeat_domains_hit_cache():
+    """Test different URLs on one domain are scored once"""
+    from app.search.credibility import _score_for_domain
+
+    _score_for_domain.cache_clear()
+    for path in ("a", "b", "c"):
+        get_credibility_score(f"https://stackoverflow.com/{path}")
+    info = _score_for_domain.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_enrich_updates_sources_in_place():
+    """Test enrichment adds score keys to the given source dicts"""
+    from app.search.credibility import enrich_with_credibility
+
+    sources = [{"url": "https://github.com/x"}, {}]
+    assert enrich_with_credibility(sources) is sources
+    assert sources[0]["credibility_score"] == 0.90
+    assert sources[1]["credibility_category"] == "unknown"
+
+
+def test_sort_by_credibility():
+    """Test enriched sources sort by score, stable for ties"""
+    from app.search.credibility import enrich_with_credibility, sort_by_credibility
+
+    sources = enrich_with_credibility(
+        [{"url": u} for u in ("https://a.com", "https://github.com", "https://b.com")]
+    )
+    ranked = sort_by_credibility(sources)
+    assert [s["url"] for s in ranked] == [
+        "https://github.com",
+        "https://a.com",
+        "https://b.com",
+    ]
+
+
+def test_sort_by_credibility_defaults_missing_score():
+    """Test sources without a score sort as 0.5 instead of raising"""
+    from app.search.credibility import sort_by_credibility
+
+    sources = [{"url": "low", "credibility_score": 0.3}, {"url": "none"}]
+    sources.append({"url": "high", "credibility_score": 0.9})
+    assert [s["url"] for s in sort_by_credibility(sources)] == ["high", "none", "low"]
+
+
+def test_get_domain():
+    """Test the netloc is sliced out, lowercased, and stripped of www."""
+    from app.search.credibility import get_domain
+
+    assert get_domain("https://www.GitHub.com/x?y#z") == "github.com"
+    assert get_domain("http://a.com?q=1") == "a.com"
+    assert get_domain("https://h.org:8080#frag") == "h.org:8080"
+    assert get_domain("github.com/a://b.com") == ""
+    assert get_domain("http://[::1") == ""
+
+
+def test_scheme_relative_url_keeps_domain_score():
+    """Test "//host/path" URLs resolve to their host, as urlparse does"""
+    from app.search.credibility import get_credibility_score, get_domain
+
+    assert get_domain("//www.GitHub.com/x") == "github.com"
+    assert get_credibility_score("//github.com/x") == get_credibility_score(
+        "https://github.com/x"
+    )
@@ -0,0 +1,90 @@
+"""
+Export API Tests
+
+Tests for batch export job validation and formatting (no LLM calls).
+"""
+
+import orjson
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.output import JsonFormatter
+
+client = TestClient(app)
+
+
+def test_batch_rejects_empty_list():
+    """Test batch export requires at least one query"""
+    response = client.post("/api/v1/search/batch", json=[])
+    assert response.status_code == 400
+
+
+def test_batch_rejects_oversized_list():
+    """Test batch export caps the number of queries"""
+    payload = [{"query": f"q{i}"} for i in range(settings.BATCH_MAX_QUERIES + 1)]
+    response = client.post("/api/v1/search/batch", json=payload)
+    assert response.status_code == 413
+
+
+def test_batch_unknown_job():
+    """Test fetching an unknown batch job returns 404"""
+    response = client.get("/api/v1/search/batch/does-not-exist")
+    assert response.status_code == 404
+
+
+def test_json_bytes_match_formatted_dict():
+    """Test format_bytes encodes the same document, with a Z timestamp"""
+    result = {"question": "q", "answer": "a", "sources": ["https://a.org"]}
+    encoded = orjson.loads(JsonFormatter.format_bytes(result))
+    expected = JsonFormatter.format(result)
+
+    assert encoded.pop("metadata")["timestamp"].endswith("Z")
+    expected.pop("metadata")
+    assert encoded == expected
+
+
+def test_json_without_metadata():
+    """Test include_metadata=False leaves the metadata key out entirely"""
+    output = JsonFormatter.format({"question": "q"}, include_metadata=False)
+    assert list(output) == ["query", "answer", "confidence", "sources", "context"]
+
+
+def test_batch_partitions_requests_by_options(monkeypatch):
+    """Test skip_cache/include_context apply per request, in input order"""
+    import asyncio
+
+    import app.api.exports as exports
+    from app.api.models import ExportRequest
+
+    calls = []
+
+    class Service:
+        async def search_batch(self, queries, skip_cache, include_context):
+            calls.append((queries, skip_cache, include_context))
+            return [
+                {"question": q, "context": [] if include_context else None}
+                for q in queries
+            ]
+
+    async def get_service():
+        return Service()
+
+    monkeypatch.setattr(exports, "get_search_service", get_service)
+    requests = [
+        ExportRequest(query="a"),
+        ExportRequest(query="b", skip_cache=True),
+        ExportRequest(query="c", include_context=False),
+        ExportRequest(query="d"),
+    ]
+    job = {"job_id": "j"}
+    asyncio.run(exports._run_batch(job, requests))
+
+    assert job["status"] == "completed"
+    assert [r["question"] for r in job["results"]] == ["a", "b", "c", "d"]
+    assert job["results"][2]["context"] is None
+    assert sorted(calls) == [
+        (["a", "d"], False, True),
+        (["b"], True, True),
+        (["c"], False, False),
+    ]
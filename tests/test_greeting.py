@@ -0,0 +1,56 @@
+"""
+Greeting Detection Tests
+
+Tests for the greeting/casual-conversation matcher.
+"""
+
+from app.utils.greeting import is_greeting
+
+
+def test_prefix_and_casual_matches():
+    """Test queries starting with a greeting or casual phrase match"""
+    assert is_greeting("Hello there, can you explain monads in detail?")
+    assert is_greeting("  how are you doing today my friend  ")
+
+
+def test_short_query_contains_greeting():
+    """Test greetings inside short queries match, but not in long ones"""
+    assert is_greeting("well hey")
+    assert not is_greeting("explain the design of the hey email client")
+
+
+def test_regular_query_is_not_greeting():
+    """Test an ordinary search query is not a greeting"""
+    assert not is_greeting("python decorators tutorial")
+
+
+def test_greeting_words_match_whole_tokens():
+    """Test short queries match greeting words, not substrings of words"""
+    assert is_greeting("oh, hello!")
+    assert is_greeting("well good morning")
+    assert not is_greeting("shipping costs")
+
+
+def test_casual_phrases_match_as_prefixes():
+    """Test every casual phrase matches when followed by more text"""
+    from app.utils.greeting import CASUAL_PATTERNS
+
+    for phrase in CASUAL_PATTERNS:
+        assert is_greeting(f"{phrase} today, and can you explain decorators?")
+
+
+def test_greeting_response_is_a_fresh_copy():
+    """Test each call returns an equal dict that callers may extend"""
+    from app.utils.greeting import get_greeting_response
+
+    first = get_greeting_response()
+    first["cached"] = True
+    assert "cached" not in get_greeting_response()
+    assert get_greeting_response()["is_greeting"] is True
+
+
+def test_greeting_case_and_script_independent():
+    """Test lowercase, mixed-case and non-ASCII inputs classify the same way"""
+    for query in ("  hello there ", "  HELLO There ", "hi 👋", "Hi 👋"):
+        assert is_greeting(query)
+    assert not is_greeting("ÉCOLE python decorators explained in depth")
@@ -0,0 +1,90 @@
+"""
+MCP Formatting Tests
+
+Tests for MCP tool handlers and the text rendering of their results
+(no network calls).
+"""
+
+import asyncio
+
+from app.mcp import mcp_server
+from app.mcp.mcp_server import (
+    _format_job_pending,
+    _format_research_result,
+    _format_search_result,
+    _format_sources_result,
+)
+
+
+def test_format_search_result():
+    """Test answer, confidence, cache note and the first five sources"""
+    text = _format_search_result(
+        {
+            "answer": "A",
+            "confidence": 0.9,
+            "cached": True,
+            "sources": [f"https://s{i}.org" for i in range(7)],
+        }
+    )
+    assert text.startswith("**Answer:**\nA\n\n**Confidence:** 90%\n*(from cache)*")
+    assert "**Sources (7):**\n  1. https://s0.org" in text
+    assert text.endswith("  5. https://s4.org")
+
+
+def test_format_research_result():
+    """Test one section per explored query, then the source list"""
+    text = _format_research_result(
+        {
+            "topic": "rust",
+            "queries_explored": 1,
+            "research": [{"query": "rust", "answer": "A systems language"}],
+            "sources": ["https://rust-lang.org"],
+        }
+    )
+    assert text == (
+        "# Research: rust\n\n*Explored 1 queries*\n\n"
+        "## rust\nA systems language\n\n"
+        "## Sources (1)\n- https://rust-lang.org"
+    )
+
+
+def test_format_sources_result_error():
+    """Test errors short-circuit the sources listing"""
+    assert _format_sources_result({"error": "down"}) == "Error: down"
+
+
+def test_format_job_pending_names_poll_tool():
+    """Test a pending research job points the agent at poll_job"""
+    text = _format_job_pending("abc123")
+    assert "`abc123`" in text and "poll_job" in text
+
+
+def test_slow_research_becomes_pollable_job(monkeypatch):
+    """Test research past MCP_JOB_WAIT returns a job id that poll_job resolves"""
+
+    class Tools:
+        async def research_topic(self, topic, depth):
+            await asyncio.sleep(0.05)
+            return {"topic": topic, "queries_explored": 0}
+
+    monkeypatch.setattr(mcp_server.settings, "MCP_JOB_WAIT", 0.0)
+    handlers = mcp_server._HANDLERS
+
+    async def run():
+        pending = await handlers["research_topic"](Tools(), {"topic": "rust"})
+        job = {"job_id": pending.split("`")[1]}
+        await asyncio.sleep(0.1)
+        return pending, await handlers["poll_job"](None, job)
+
+    pending, done = asyncio.run(run())
+    assert "poll_job" in pending
+    assert done.startswith("# Research: rust")
+
+
+def test_search_tools_delegate_to_given_service():
+    """Test SearchTools reuses a passed-in service instead of building one"""
+    from app.mcp.search_tool import SearchTools
+    from app.services import SearchService
+
+    service = SearchService()
+    assert SearchTools(service=service)._service is service
@@ -0,0 +1,225 @@
+"""
+Pipeline Helper Tests
+
+Tests for DSPyPipeline's pure formatting/parsing helpers (no LLM calls).
+"""
+
+from types import SimpleNamespace
+
+from app.ai.pipeline import DSPyPipeline
+from app.utils.text import count_tokens
+
+RAW = [{"url": f"https://site{i}.org", "credibility_score": 0.5} for i in range(6)]
+
+
+class TestPipelineHelpers:
+    """Test prompt-building and citation helpers"""
+
+    def test_stable_order_ignores_input_order(self):
+        """Test selected indices are ordered the same regardless of input order"""
+        assert DSPyPipeline._stable_order([1, 3, 5], RAW) == DSPyPipeline._stable_order(
+            [5, 1, 3], RAW
+        )
+
+    def test_numbered_context_canonicalizes_whitespace(self):
+        """Test passages are whitespace-normalized and numbered"""
+        context = DSPyPipeline._numbered_context(["a  b\n c ", "d"], [1, 0])
+        assert context == "[0] d\n\n[1] a b c"
+
+    def test_remap_citations(self):
+        """Test candidate-index citations are renumbered to source positions"""
+        answer, indices = DSPyPipeline._remap_citations(
+            "See [2] and [0][9], not arr[0].", [2], 6
+        )
+        assert answer == "See [0] and [1][9], not arr[0]."
+        assert indices == [2, 0]
+
+    def test_fit_context_stops_at_passage_boundary(self):
+        """Test context is built from whole passages within the token budget"""
+        passages = ["word " * 100, "word " * 100, "word " * 100]
+        context, kept = DSPyPipeline._fit_context(passages, [2, 0, 1], 300)
+        assert kept == [2, 0]
+        assert context.startswith("[0] word") and "[1] word" in context
+        assert "[2]" not in context
+
+    def test_fit_context_clips_oversized_passage(self):
+        """Test a lone passage over budget is truncated to the budget"""
+        context, kept = DSPyPipeline._fit_context(["word " * 10000], [0], 50)
+        assert kept == [0]
+        assert context.startswith("[0] word")
+        assert count_tokens(context) <= 50
+
+    def test_select_indices_parses_llm_output(self):
+        """Test ranker output in various formats parses to valid indices"""
+        passages = ["p"] * 6
+        for raw in ("[1, 3, 5]", "1.3.5", "indices: 1 and 3, 5"):
+            indices = DSPyPipeline._select_indices(raw, passages, RAW)
+            assert sorted(indices) == [1, 3, 5]
+
+    def test_dedupe_by_url_keeps_first_and_limits(self):
+        """Test duplicate URLs are dropped and output is capped"""
+        raw = [{"url": u} for u in ["a", "b", "a", "c", "d"]]
+        unique_raw, unique_passages = DSPyPipeline._dedupe_by_url(
+            raw, ["pa", "pb", "pa2", "pc", "pd"], limit=3
+        )
+        assert [r["url"] for r in unique_raw] == ["a", "b", "c"]
+        assert unique_passages == ["pa", "pb", "pc"]
+
+    def test_is_complex_query(self):
+        """Test complexity indicators are detected case-insensitively"""
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        assert pipeline._is_complex_query("Compare Rust VS Go")
+        assert pipeline._is_complex_query("pros and cons of GraphQL")
+        assert not pipeline._is_complex_query("python decorators")
+
+    def test_rerank_context_pads_missing_credibility(self):
+        """Test rerank lines default credibility when raw results run short"""
+        context = DSPyPipeline._rerank_context(["alpha", "beta"], RAW[:1])
+        assert context == (
+            "[0] (credibility: 0.50) alpha...\n[1] (credibility: 0.50) beta..."
+        )
+
+    def test_extract_confidence(self):
+        """Test confidence parsing from varied LLM output"""
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        cases = {
+            0.92: 0.92,
+            1.4: 1.0,
+            "0.85 (high)": 0.85,
+            "confidence: 0.9": 0.9,
+            "85%": 0.85,
+            "high": 0.7,
+        }
+        for raw, expected in cases.items():
+            result = SimpleNamespace(confidence=raw)
+            assert pipeline._extract_confidence(result) == expected
+
+    def test_build_response_skips_missing_results(self):
+        """Test out-of-range indices and empty URLs are dropped in one pass"""
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        pipeline._lm = SimpleNamespace(model="test-model")
+        pipeline._model_name = "test-model"
+        raw = [{"url": "https://a.org", "content": "x" * 600}, {"url": ""}]
+        result = SimpleNamespace(answer="A [0]", confidence=0.9)
+
+        response = pipeline._build_response("q", result, [0, 1, 7], raw)
+        assert len(response["context"]) == 2
+        assert len(response["context"][0]["text"]) == 500
+        assert response["sources"] == ["https://a.org"]
+        assert response["model_used"] == "test-model"
+
+    def test_build_response_without_context(self):
+        """Test include_context=False skips the context list but keeps sources"""
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        pipeline._lm = SimpleNamespace(model="test-model")
+        pipeline._model_name = "test-model"
+        raw = [{"url": "https://a.org", "content": "x"}, {"url": ""}]
+        result = SimpleNamespace(answer="A [0]", confidence=0.9)
+
+        response = pipeline._build_response("q", result, [0, 1], raw, False)
+        assert response["context"] is None
+        assert response["sources"] == ["https://a.org"]
+
+    def test_complex_search_retrieves_only_sub_queries(self):
+        """Test the complex path searches each sub-query once and nothing else"""
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        searched = []
+
+        def retrieve(query):
+            searched.append(query)
+            return [], []
+
+        pipeline.retriever = SimpleNamespace(retrieve=retrieve)
+        pipeline._decompose_query = lambda question: ["rust speed", "go speed"]
+
+        assert pipeline._complex_search("Compare Rust vs Go")["sources"] == []
+        assert sorted(searched) == ["go speed", "rust speed"]
+
+    def test_budget_drops_lowest_ranked_before_hash_order(self, monkeypatch):
+        """Test the budget keeps the reranker's best passages, then hash-orders"""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "ENABLE_PROMPT_COMPRESSION", False)
+        by_hash = DSPyPipeline._stable_order(list(range(6)), RAW)
+        best, second, third = by_hash[-1], by_hash[0], by_hash[1]
+        passages = ["word " * 100] * 6
+
+        indices = DSPyPipeline._select_indices(
+            f"{best}, {second}, {third}", passages, RAW
+        )
+        assert indices == [best, second, third]
+
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        _, kept = pipeline._build_context("q", passages, indices, 300, RAW)
+        assert kept == [second, best]
+
+    def test_prefilter_trims_with_shipped_defaults(self):
+        """Test the service's retrieval depth leaves the BM25 prefilter work"""
+        from app.core.config import Settings
+        from app.services import SearchService
+
+        defaults = {name: f.default for name, f in Settings.model_fields.items()}
+        k = SearchService()._k_results
+        assert k == defaults["SEARCH_K_RESULTS"] > defaults["RERANK_PREFILTER_K"]
+
+        raw = [{"url": f"https://site{i}.org"} for i in range(k)]
+        passages = [f"unrelated passage {i}" for i in range(k)]
+        passages[7] = "python decorators explained"
+        kept, kept_raw = DSPyPipeline._prefilter("python decorators", passages, raw)
+        assert len(kept) == defaults["RERANK_PREFILTER_K"]
+        assert "python decorators explained" in kept
+        assert len(kept_raw) == len(kept)
+
+    def _multi_pipeline(self, monkeypatch, fuse, outputs):
+        """Pipeline whose retriever and batched LLM calls are stubbed"""
+        monkeypatch.setattr(DSPyPipeline, "_fuse_stages", fuse)
+        pipeline = DSPyPipeline.__new__(DSPyPipeline)
+        pipeline._lm = SimpleNamespace(model="test-model")
+        pipeline._model_name = "test-model"
+        pipeline._lm_fast = None
+        pipeline.fused = pipeline.ranker = pipeline.answer = None
+        pipeline._answer_cache = pipeline._rerank_cache = None
+        raw = [{"url": "https://a.org", "content": "Rust is fast"}]
+        pipeline.retriever = SimpleNamespace(
+            retrieve=lambda q: ([], []) if q == "empty" else (["Rust is fast"], raw)
+        )
+        calls = []
+
+        def batched_call(signature, module, cache, inputs):
+            calls.append(signature)
+            return [outputs[signature]] * len(inputs)
+
+        pipeline._batched_call = batched_call
+        return pipeline, calls
+
+    def test_multi_uses_fused_stage_and_skips_context(self, monkeypatch):
+        """Test batches take the fused path and honour include_context"""
+        fused = SimpleNamespace(answer="Fast [0]", selected_indices="0", confidence=0.9)
+        pipeline, calls = self._multi_pipeline(monkeypatch, True, {"FusedQA": fused})
+
+        rust, empty = pipeline.search_and_answer_multi(["rust", "empty"], False)
+        assert calls == ["FusedQA"]
+        assert rust["answer"] == "Fast [0]" and rust["sources"] == ["https://a.org"]
+        assert rust["context"] is None
+        assert empty["sources"] == []
+
+    def test_multi_falls_back_to_staged_calls(self, monkeypatch):
+        """Test failed fused calls are answered by batched rerank + answer"""
+        outputs = {
+            "FusedQA": None,
+            "ContextRanker": SimpleNamespace(selected_indices="0"),
+            "SearchQA": SimpleNamespace(answer="Staged [0]", confidence=0.8),
+        }
+        pipeline, calls = self._multi_pipeline(monkeypatch, True, outputs)
+
+        (rust,) = pipeline.search_and_answer_multi(["rust"])
+        assert calls == ["FusedQA", "ContextRanker", "SearchQA"]
+        assert rust["answer"] == "Staged [0]" and rust["context"]
+
+    def test_multi_serves_semantic_hits_without_retrieval(self, monkeypatch):
+        """Test semantic-cache hits skip retrieval and the LLM batch"""
+        pipeline, calls = self._multi_pipeline(monkeypatch, True, {})
+        pipeline._semantic_lookup = lambda q: {"question": q, "answer": "cached"}
+
+        assert pipeline.search_and_answer_multi(["rust"])[0]["answer"] == "cached"
+        assert calls == []
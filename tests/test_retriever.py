@@ -0,0 +1,121 @@
+"""
+SearXNG Retriever Tests
+
+Tests for result parsing and the async retrieval path (mocked transport).
+"""
+
+import asyncio
+
+import httpx
+
+from app.search.dspy_retriever import SearXNGRetriever
+
+DATA = {
+    "results": [
+        {
+            "title": "Python",
+            "content": "A language",
+            "url": "https://python.org",
+            "engine": "duckduckgo",
+            "positions": [1],
+            "parsed_url": ["https", "python.org", "", "", "", ""],
+        },
+        {"title": "Extra", "content": "Over k", "url": "https://example.com"},
+    ]
+}
+
+
+def test_parse_limits_and_enriches_results():
+    """Test results are capped at k, enriched, and turned into passages"""
+    passages, raw = SearXNGRetriever._parse(DATA, 1)
+    assert passages == ["Python\nA language"]
+    assert len(raw) == 1
+    assert "credibility_score" in raw[0]
+
+
+def test_parse_drops_unused_searxng_fields():
+    """Test only the fields downstream code reads are kept per result"""
+    _, raw = SearXNGRetriever._parse(DATA, 2)
+    assert set(raw[0]) == {
+        "title",
+        "content",
+        "url",
+        "engine",
+        "credibility_score",
+        "credibility_category",
+    }
+    assert "engine" not in raw[1]
+
+
+def test_aretrieve_uses_async_client():
+    """Test aretrieve queries SearXNG over the pooled async client"""
+    retriever = SearXNGRetriever(searx_url="http://searx.test", k=5)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.params["q"])
+        return httpx.Response(200, json=DATA)
+
+    async def run():
+        retriever._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        retriever._aclient_loop = asyncio.get_running_loop()
+        result = await retriever.aretrieve("python")
+        client = retriever._aclient
+        await retriever.aclose()
+        return result, client
+
+    (passages, raw), client = asyncio.run(run())
+    assert seen == ["python"]
+    assert len(passages) == len(raw) == 2
+    assert client.is_closed and retriever._aclient is None
+
+
+def test_searxng_clients_share_one_pool():
+    """Test SearXNGClient instances reuse the process-wide pool across close()"""
+    from app.core import http
+    from app.search.searxng_client import SearXNGClient
+
+    async def run():
+        async with SearXNGClient():
+            first = http.get_http_client()
+        second = http.get_http_client()
+        await http.close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.is_closed and http._client is None
+
+
+def test_retrieve_uses_pooled_sync_client():
+    """Test retrieve queries SearXNG over the pooled sync client"""
+    retriever = SearXNGRetriever(searx_url="http://searx.test", k=1)
+    retriever._client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=DATA))
+    )
+
+    passages, raw = retriever.retrieve("python")
+    assert len(passages) == len(raw) == 1
+
+    asyncio.run(retriever.aclose())
+    assert retriever._client.is_closed
+
+
+def test_repeat_queries_served_from_cache():
+    """Test normalized repeat queries skip SearXNG, failures are not cached"""
+    retriever = SearXNGRetriever(searx_url="http://searx.test", k=1)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        if request.url.params["q"] == "down":
+            return httpx.Response(503)
+        return httpx.Response(200, json=DATA)
+
+    retriever._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    first = retriever.retrieve("Python")
+    assert retriever.retrieve("  python ") == first
+    assert retriever.retrieve("python", k=2) != first
+    assert retriever.retrieve("down") == retriever.retrieve("down") == ([], [])
+    assert calls == ["Python", "python", "down", "down"]
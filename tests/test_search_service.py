@@ -0,0 +1,231 @@
+"""
+Search Service Tests
+
+Tests for SearchService orchestration (search itself is stubbed).
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import SearchService
+
+
+class StubCache:
+    """Cache client that only hits for the given query -> result dict"""
+
+    def __init__(self, hits=None):
+        self.hits = hits or {}
+
+    def key_for(self, query):
+        return query
+
+    async def get_by_key(self, key):
+        return self.hits.get(key)
+
+    async def get_many(self, queries):
+        return {q: self.hits[q] for q in queries if q in self.hits}
+
+
+class StubService(SearchService):
+    """SearchService whose search sleeps instead of calling the pipeline"""
+
+    def __init__(self, fail=(), cached=None):
+        super().__init__(cache=StubCache(cached))
+        self.fail = fail
+        self.running = 0
+        self.peak = 0
+        self.with_context = []
+        self.searched = []
+
+    async def search(self, query, skip_cache=False, include_context=True):
+        self.with_context.append(include_context)
+        self.searched.append((query, skip_cache))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if query in self.fail:
+            raise RuntimeError("boom")
+        return {
+            "answer": f"about {query}",
+            "sources": [f"https://{len(query)}.org", "https://shared.org"],
+        }
+
+
+async def _collect_stream(service, query="rust"):
+    return [e async for e in service.search_streaming(query)]
+
+
+def test_research_topic_runs_queries_concurrently():
+    """Test related queries overlap and a failed one is skipped"""
+    service = StubService(fail=("rust benefits",))
+    result = asyncio.run(service.research_topic("rust", depth=3))
+
+    assert service.peak == 3
+    assert service.with_context == [False] * 3
+    assert [r["query"] for r in result["research"]] == ["rust", "what is rust"]
+    assert result["queries_explored"] == 2
+    assert result["sources"] == [
+        "https://4.org",
+        "https://shared.org",
+        "https://12.org",
+    ]
+
+
+def test_research_topic_checks_cache_in_one_batch():
+    """Test cached related queries skip search; misses skip the cache"""
+    hit = {"answer": "cached", "sources": ["https://c.org"]}
+    service = StubService(cached={"what is rust": hit})
+    result = asyncio.run(service.research_topic("rust", depth=3))
+
+    assert service.searched == [("rust", True), ("rust benefits", True)]
+    assert [r["answer"] for r in result["research"]] == [
+        "about rust",
+        "cached",
+        "about rust benefits",
+    ]
+
+
+def test_research_topic_raises_when_all_fail():
+    """Test the error surfaces when no related query succeeds"""
+    service = StubService(fail=("rust",))
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(service.research_topic("rust", depth=1))
+
+
+def test_services_share_one_pipeline(monkeypatch):
+    """Test separate SearchService instances reuse one pipeline"""
+    import app.services.search as search_module
+
+    built = []
+    monkeypatch.setattr(search_module, "_shared_pipelines", {})
+    monkeypatch.setattr(
+        search_module,
+        "DSPyPipeline",
+        lambda k_results: built.append(k_results) or object(),
+    )
+
+    first = SearchService()._get_pipeline()
+    assert SearchService()._get_pipeline() is first
+    assert built == [settings.SEARCH_K_RESULTS]
+
+
+def test_concurrent_first_use_builds_one_pipeline(monkeypatch):
+    """Test racing first calls construct the shared pipeline only once"""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import app.services.search as search_module
+
+    built = []
+
+    def slow_pipeline(k_results):
+        built.append(k_results)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(search_module, "_shared_pipelines", {})
+    monkeypatch.setattr(search_module, "DSPyPipeline", slow_pipeline)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pipelines = list(pool.map(lambda _: SearchService()._get_pipeline(), range(8)))
+    assert built == [settings.SEARCH_K_RESULTS]
+    assert all(p is pipelines[0] for p in pipelines)
+
+
+def test_get_sources_returns_trimmed_plain_dicts():
+    """Test sources are plain dicts capped at limit with 300-char snippets"""
+
+    class Retriever:
+        async def aretrieve(self, query, k=None):
+            raw = [
+                {"title": f"T{i}", "url": f"https://{i}.org", "content": "x" * 500}
+                for i in range(k + 2)
+            ]
+            return [], raw
+
+    service = SearchService(pipeline=type("P", (), {"retriever": Retriever()})())
+    result = asyncio.run(service.get_sources("rust", limit=2))
+
+    assert result["total_found"] == 4
+    assert [type(s) for s in result["sources"]] == [dict, dict]
+    assert result["sources"][0] == {
+        "title": "T0",
+        "url": "https://0.org",
+        "snippet": "x" * 300,
+        "engine": "unknown",
+    }
+
+
+def test_research_topic_dedupes_dict_sources_by_url():
+    """Test source dicts are deduplicated by URL in first-seen order"""
+
+    class DictSourceService(StubService):
+        async def search(self, query, skip_cache=False, include_context=True):
+            return {
+                "answer": query,
+                "sources": [{"url": "https://a.org", "q": query}, "https://b.org"],
+            }
+
+    result = asyncio.run(DictSourceService().research_topic("rust", depth=2))
+    assert result["sources"] == [{"url": "https://a.org", "q": "rust"}, "https://b.org"]
+
+
+def test_first_search_builds_pipeline_off_the_loop(monkeypatch):
+    """Test lazy pipeline construction runs in a worker thread"""
+    import threading
+
+    import app.services.search as search_module
+
+    threads = []
+
+    def build(k_results):
+        threads.append(threading.current_thread())
+        raise ValueError("no LLM configured")
+
+    monkeypatch.setattr(search_module, "_shared_pipelines", {})
+    monkeypatch.setattr(search_module, "DSPyPipeline", build)
+
+    events = asyncio.run(_collect_stream(SearchService(cache=StubCache())))
+    assert threads and threads[0] is not threading.main_thread()
+    assert events[-1] == {
+        "type": "error",
+        "message": "Configuration error: no LLM configured",
+    }
+
+
+def test_streaming_frees_admission_slot_before_client_drains():
+    """Test a slow SSE consumer does not keep holding a pipeline slot"""
+    from types import SimpleNamespace
+
+    class Cache(StubCache):
+        async def set_by_key(self, key, value):
+            pass
+
+    async def astream_answer(query):
+        yield {"type": "token", "content": "a"}
+        yield {"type": "token", "content": "b"}
+        yield {"type": "result", "result": {"sources": ["https://a.org"]}}
+
+    service = SearchService(cache=Cache())
+    pipeline = SimpleNamespace(_model_name="m", astream_answer=astream_answer)
+
+    async def aget_pipeline():
+        return pipeline
+
+    service._aget_pipeline = aget_pipeline
+
+    async def run():
+        stream = service.search_streaming("rust")
+        while (await stream.__anext__())["type"] != "token":
+            pass
+        await asyncio.sleep(0.01)  # Client stalls after the first token
+        inflight = service._admission.inflight
+        return inflight, [e async for e in stream]
+
+    inflight, rest = asyncio.run(run())
+    assert inflight == 0
+    assert [e["type"] for e in rest] == ["token", "done"]
+    assert rest[-1]["sources"] == ["https://a.org"]
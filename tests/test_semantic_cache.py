@@ -0,0 +1,98 @@
+"""
+Semantic Cache Tests
+
+Tests for near-duplicate question caching.
+"""
+
+from app.cache.semantic import SemanticCache
+
+RESULT = {"answer": "Python is a language [0]", "sources": ["https://python.org"]}
+
+
+def test_rephrased_question_hits(tmp_path):
+    """Test a rephrasing with the same content words returns the cached answer"""
+    cache = SemanticCache(directory=str(tmp_path), threshold=0.95)
+    cache.set("What is Python?", RESULT)
+    assert cache.get("Tell me about python") == RESULT
+    cache.close()
+
+
+def test_different_question_misses(tmp_path):
+    """Test questions with different content words don't collide"""
+    cache = SemanticCache(directory=str(tmp_path), threshold=0.95)
+    cache.set("What is Python 3?", RESULT)
+    assert cache.get("What is Python 2?") is None
+    assert cache.get("What is Rust?") is None
+    cache.close()
+
+
+def test_index_reloads_from_disk(tmp_path):
+    """Test entries persist across cache instances"""
+    SemanticCache(directory=str(tmp_path)).set("python decorators", RESULT)
+    cache = SemanticCache(directory=str(tmp_path))
+    assert cache.get("explain python decorators") == RESULT
+    cache.close()
+
+
+def test_reversed_question_misses(tmp_path):
+    """Test questions with the same words in a different order don't collide"""
+    cache = SemanticCache(directory=str(tmp_path), threshold=0.95)
+    cache.set("Is Python faster than Java?", RESULT)
+    cache.set("convert celsius to fahrenheit", RESULT)
+    assert cache.get("Is Java faster than Python?") is None
+    assert cache.get("convert fahrenheit to celsius") is None
+    assert cache.get("is python faster than java") == RESULT
+    cache.close()
+
+
+def test_lookalike_questions_miss(tmp_path):
+    """Test questions differing only in an operator or question word miss"""
+    cache = SemanticCache(directory=str(tmp_path), threshold=0.95)
+    cache.set("what is 2+2", RESULT)
+    cache.set("how do I learn rust", RESULT)
+    assert cache.get("what is 2*2") is None
+    assert cache.get("who should learn rust") is None
+    assert cache.get("why learn rust") is None
+    assert cache.get("What is 2 + 2?") == RESULT
+    cache.close()
+
+
+def test_entries_are_scoped_to_the_model(tmp_path):
+    """Test an answer cached for one model is not served for another"""
+    cache = SemanticCache(directory=str(tmp_path), threshold=0.95)
+    cache.set("What is Python?", RESULT, model="groq/llama")
+    assert cache.get("What is Python?", model="openai/gpt-4o") is None
+    assert cache.get("What is Python?") is None
+    assert cache.get("Tell me about python", model="groq/llama") == RESULT
+    cache.close()
+
+    reloaded = SemanticCache(directory=str(tmp_path))
+    assert reloaded.get("python", model="groq/llama") == RESULT
+    reloaded.close()
+
+
+def test_disabled_by_default():
+    """Test the semantic cache is opt-in"""
+    from app.core.config import Settings
+
+    assert Settings.model_fields["SEMANTIC_CACHE_ENABLED"].default is False
+
+
+def test_default_dir_is_project_local_and_untouched_when_disabled(
+    tmp_path, monkeypatch
+):
+    """Test nothing is written unless enabled, and never to the home directory"""
+    from pathlib import Path
+
+    from app.cache import semantic
+    from app.core.config import settings
+
+    project = Path(semantic.__file__).resolve().parents[2]
+    assert Path(settings.SEMANTIC_CACHE_DIR).is_relative_to(project)
+
+    directory = tmp_path / "semcache"
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_DIR", str(directory))
+    monkeypatch.setattr(semantic, "_semantic_cache", None)
+    assert semantic.get_semantic_cache() is None
+    assert not directory.exists()
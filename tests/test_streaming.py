@@ -0,0 +1,100 @@
+"""
+Streaming Tests
+
+Tests for SSE token coalescing (no network or LLM calls).
+"""
+
+import asyncio
+
+from app.api.routes import _coalesce_tokens
+
+
+async def _collect(events, **kwargs):
+    async def source():
+        for event in events:
+            yield event
+
+    return [e async for e in _coalesce_tokens(source(), **kwargs)]
+
+
+def test_coalesce_merges_token_bursts():
+    """Test rapid tokens merge, flushing before non-token events"""
+    events = [
+        {"type": "status", "message": "Searching..."},
+        *({"type": "token", "content": w} for w in ["a ", "b ", "c "]),
+        {"type": "done"},
+    ]
+    out = asyncio.run(_collect(events, interval=60))
+    assert out == [
+        {"type": "status", "message": "Searching..."},
+        {"type": "token", "content": "a "},
+        {"type": "token", "content": "b c "},
+        {"type": "done"},
+    ]
+
+
+def test_coalesce_flushes_on_size():
+    """Test the buffer flushes once it reaches max_chars"""
+    events = [{"type": "token", "content": "xx"} for _ in range(5)]
+    out = asyncio.run(_collect(events, max_chars=4, interval=60))
+    assert [e["content"] for e in out] == ["xx", "xxxx", "xxxx"]
+
+
+def test_coalesce_flushes_tail_when_stream_ends():
+    """Test tokens still buffered when the stream ends are not dropped"""
+    events = [{"type": "token", "content": w} for w in ["a ", "b ", "c"]]
+    out = asyncio.run(_collect(events, interval=60))
+    assert [e["content"] for e in out] == ["a ", "b c"]
+
+
+def test_astream_answer_yields_tokens_then_result(monkeypatch):
+    """Test the pipeline streams answer tokens before the final result"""
+    from dspy.utils.dummies import DummyLM
+
+    from app.ai.pipeline import DSPyPipeline
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "ollama")
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", False)
+    pipeline = DSPyPipeline()
+    pipeline._lm = DummyLM(
+        [{"reasoning": "r", "selected_indices": "0", "answer": "Py [0]"}]
+        + [{"reasoning": "r", "answer": "Py [0]", "confidence": "0.9"}]
+    )
+
+    async def aretrieve(query, k=None):
+        return ["Python\nA language"], [{"url": "https://python.org"}]
+
+    pipeline.retriever.aretrieve = aretrieve
+
+    async def run():
+        return [e async for e in pipeline.astream_answer("what is python")]
+
+    events = asyncio.run(run())
+    assert [e["type"] for e in events][-1] == "result"
+    tokens = "".join(e["content"] for e in events if e["type"] == "token")
+    assert tokens == events[-1]["result"]["answer"] == "Py [0]"
+    assert events[-1]["result"]["sources"] == ["https://python.org"]
+
+
+def test_stream_rejects_invalid_body():
+    """Test a mistyped query is reported as an SSE error before any search"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    response = TestClient(app).post("/api/v1/search/stream", json={"query": ["x"]})
+    assert response.status_code == 200
+    assert response.text.startswith("event: error")
+    assert "query" in response.text
+
+
+def test_stream_rejects_blank_query():
+    """Test a whitespace-only query fails validation after stripping"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    response = TestClient(app).post("/api/v1/search/stream", json={"query": "   "})
+    assert response.text.startswith("event: error")
+    assert "Invalid query" in response.text
@@ -0,0 +1,191 @@
+"""
+Suggestion Service Tests
+
+Tests for the trending-topics fetch (no network or LLM calls).
+"""
+
+import asyncio
+
+import httpx
+
+import app.services.suggestions as suggestions_module
+from app.services.suggestions import SuggestionService
+
+
+def _service() -> SuggestionService:
+    service = SuggestionService.__new__(SuggestionService)
+    service._trending = None
+    service._trending_lock = asyncio.Lock()
+    return service
+
+
+def _mock_searxng(monkeypatch, handler) -> None:
+    """Route the shared HTTP client through a mock transport"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(suggestions_module, "get_http_client", lambda: client)
+
+
+def test_trending_topics_single_flight_and_cached(monkeypatch):
+    """Test concurrent new-user fetches share one round of SearXNG requests"""
+    from app.services.suggestions import _TRENDING_QUERIES
+
+    service = _service()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        await asyncio.sleep(0.01)
+        if len(calls) <= len(_TRENDING_QUERIES):
+            return httpx.Response(503)
+        return httpx.Response(200, json={"results": [{"title": "Rust 2.0"}]})
+
+    _mock_searxng(monkeypatch, handler)
+
+    async def run():
+        failed = await service._fetch_trending_topics()
+        topics = await asyncio.gather(
+            *(service._fetch_trending_topics() for _ in range(5))
+        )
+        return failed, topics
+
+    failed, topics = asyncio.run(run())
+    assert "cloud computing" in failed
+    assert topics == ["Rust 2.0"] * 5
+    assert len(calls) == 2 * len(_TRENDING_QUERIES)
+
+
+def test_trending_topics_interleave_queries(monkeypatch):
+    """Test each query contributes titles, duplicates and failures dropped"""
+    from app.services.suggestions import _TRENDING_QUERIES
+
+    service = _service()
+    first, second = _TRENDING_QUERIES[:2]
+    titles = {first: ["A1", "A2", "Shared"], second: ["Shared", "B1"]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["q"]
+        if query not in titles:
+            return httpx.Response(503)
+        return httpx.Response(
+            200, json={"results": [{"title": t} for t in titles[query]]}
+        )
+
+    _mock_searxng(monkeypatch, handler)
+    assert asyncio.run(service._fetch_trending_topics()).split("\n") == [
+        "A1",
+        "Shared",
+        "A2",
+        "B1",
+    ]
+
+
+def test_suggestion_lines_parsed_and_stripped():
+    """Test lines are stripped and short or blank lines dropped"""
+    from app.services.suggestions import _LINE_RE
+
+    raw = "  What is Rust?  \n\nok\n\tCompare Go vs Zig\r\n  short \n"
+    assert _LINE_RE.findall(raw) == ["What is Rust?", "Compare Go vs Zig"]
+
+
+def test_concurrent_first_use_builds_one_service(monkeypatch):
+    """Test racing first calls construct the suggestion service once"""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    built = []
+
+    def slow_service():
+        built.append(1)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(suggestions_module, "_suggestion_service", None)
+    monkeypatch.setattr(suggestions_module, "SuggestionService", slow_service)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        services = list(
+            pool.map(lambda _: suggestions_module.get_suggestion_service(), range(8))
+        )
+    assert built == [1]
+    assert all(s is services[0] for s in services)
+
+
+def test_generator_uses_bound_lm(monkeypatch):
+    """Test suggestions come from the service's LM with no dspy.context"""
+    from dspy.utils.dummies import DummyLM
+
+    lm = DummyLM([{"suggestions": "How do Rust lifetimes work?\nok"}] * 2)
+    monkeypatch.setattr(SuggestionService, "_init_lm", lambda self: lm)
+    service = SuggestionService()
+
+    assert service.generate_suggestions(["rust"]) == ["How do Rust lifetimes work?"]
+    assert asyncio.run(service.generate_suggestions_async(["rust"])) == [
+        "How do Rust lifetimes work?"
+    ]
+
+
+def test_services_share_generator_but_not_lm(monkeypatch):
+    """Test instances reuse one predictor while each answers with its own LM"""
+    from dspy.utils.dummies import DummyLM
+
+    lms = iter(
+        [
+            DummyLM([{"suggestions": "First service suggestion"}]),
+            DummyLM([{"suggestions": "Second service suggestion"}]),
+        ]
+    )
+    monkeypatch.setattr(SuggestionService, "_init_lm", lambda self: next(lms))
+    first, second = SuggestionService(), SuggestionService()
+
+    assert first.generator is second.generator
+    assert second.generate_suggestions(["x"]) == ["Second service suggestion"]
+    assert first.generate_suggestions(["x"]) == ["First service suggestion"]
+
+
+def test_request_titles_stops_at_eight(monkeypatch):
+    """Test per-query titles skip blanks and stop once 8 are collected"""
+    service = _service()
+    results = [{"title": f"T{i}" if i else ""} for i in range(20)]
+    _mock_searxng(
+        monkeypatch, lambda request: httpx.Response(200, json={"results": results})
+    )
+
+    titles = asyncio.run(service._request_titles("q"))
+    assert titles == [f"T{i}" for i in range(1, 9)]
+
+
+def test_warm_up_primes_trending_cache(monkeypatch):
+    """Test warm_up leaves fresh trending topics for the first request"""
+    service = _service()
+    _mock_searxng(
+        monkeypatch,
+        lambda request: httpx.Response(200, json={"results": [{"title": "Rust 2.0"}]}),
+    )
+
+    asyncio.run(service.warm_up())
+    assert service._cached_trending() == "Rust 2.0"
+
+
+def test_close_suggestion_service_resets_singleton(monkeypatch):
+    """Test shutdown closes the service and the next lifespan gets a new one"""
+    monkeypatch.setattr(suggestions_module, "SuggestionService", _service)
+    monkeypatch.setattr(suggestions_module, "_suggestion_service", None)
+
+    first = suggestions_module.get_suggestion_service()
+    first._trending = (0.0, "Rust 2.0")
+    asyncio.run(suggestions_module.close_suggestion_service())
+
+    assert first._trending is None
+    assert suggestions_module._suggestion_service is None
+    assert suggestions_module.get_suggestion_service() is not first
+
+
+def test_trending_topics_fall_back_when_no_titles(monkeypatch):
+    """Test an empty SearXNG answer yields the shared fallback topics"""
+    service = _service()
+    _mock_searxng(
+        monkeypatch, lambda request: httpx.Response(200, json={"results": []})
+    )
+
+    topics = asyncio.run(service._request_trending_topics())
+    assert topics == suggestions_module.FALLBACK_TRENDING_TOPICS
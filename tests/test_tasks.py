@@ -0,0 +1,43 @@
+"""
+Background Task Tests
+
+Tests for tracked fire-and-forget jobs.
+"""
+
+import asyncio
+import logging
+
+from app.core import tasks
+
+
+def test_failed_task_is_logged_and_forgotten(caplog):
+    """Test a failing job is dropped from the set and its error logged"""
+
+    async def boom():
+        raise RuntimeError("boom")
+
+    async def run():
+        task = tasks.run_in_background(boom(), name="job-1")
+        assert task in tasks._tasks
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        return task
+
+    with caplog.at_level(logging.ERROR, logger="app.core.tasks"):
+        task = asyncio.run(run())
+    assert task not in tasks._tasks
+    assert "job-1 failed: boom" in caplog.text
+
+
+def test_cancel_background_tasks_stops_running_jobs():
+    """Test shutdown cancels jobs that are still running"""
+
+    async def run():
+        task = tasks.run_in_background(asyncio.sleep(60), name="slow")
+        await asyncio.sleep(0)
+        await tasks.cancel_background_tasks()
+        return task
+
+    task = asyncio.run(run())
+    assert task.cancelled()
+    assert not tasks._tasks
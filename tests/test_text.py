@@ -0,0 +1,25 @@
+"""
+Text Utility Tests
+
+Tests for whitespace cleanup and truncation helpers.
+"""
+
+from app.utils.text import clean_text, truncate_many, truncate_text
+
+
+def test_clean_text_collapses_whitespace():
+    """Test runs of whitespace collapse and ends are trimmed"""
+    assert clean_text("  a \t b\n\n c ") == "a b c"
+
+
+def test_truncate_text():
+    """Test long text is cut with an ellipsis and short text is unchanged"""
+    text = "abcdef"
+    assert truncate_text(text, 6) is text
+    assert truncate_text(text, 3) == "abc..."
+
+
+def test_truncate_many_matches_truncate_text():
+    """Test the batch helper truncates each text like truncate_text"""
+    texts = ["short", "a much longer text"]
+    assert truncate_many(texts, 6) == [truncate_text(t, 6) for t in texts]